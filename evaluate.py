@@ -26,22 +26,164 @@ Usage:
 """
 
 import json
+import re
 import time
+import hashlib
+import itertools
+import shutil
+import sys
 import argparse
+import functools
 import asyncio
+import threading
+import uuid
 from datetime import datetime
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional
+from types import SimpleNamespace
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+@functools.lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """Command-line parser, built once per process"""
+    parser = argparse.ArgumentParser(
+        description="Unified Procurement Assistant Evaluation Framework"
+    )
+    parser.add_argument(
+        "--queries",
+        type=str,
+        default="evaluate.txt",
+        help="Path to queries file (default: evaluate.txt)"
+    )
+    parser.add_argument(
+        "--sample",
+        type=int,
+        default=None,
+        help="Evaluate only first N queries"
+    )
+    parser.add_argument(
+        "--run-name",
+        type=str,
+        default=None,
+        help="Custom MLflow run name"
+    )
+    parser.add_argument(
+        "--experiment",
+        type=str,
+        default="procurement-assistant-evaluation",
+        help="MLflow experiment name"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=16,
+        help="Maximum number of concurrent workflow runs (default: 16)"
+    )
+    judge_mode = parser.add_mutually_exclusive_group()
+    judge_mode.add_argument(
+        "--async-judges",
+        action="store_true",
+        help="Score with concurrent AsyncOpenAI calls instead of mlflow.genai judges"
+    )
+    judge_mode.add_argument(
+        "--batch-judges", "--offline",
+        action="store_true",
+        help="Score through the OpenAI Batch API (cheaper, can take up to 24h)"
+    )
+    judge_mode.add_argument(
+        "--combined-judge",
+        action="store_true",
+        help="Score all criteria of a sample with a single judge call"
+    )
+    parser.add_argument(
+        "--judge-concurrency",
+        type=int,
+        default=32,
+        help="Maximum number of concurrent judge calls (default: 32)"
+    )
+    parser.add_argument(
+        "--judge-batch-size",
+        type=int,
+        default=1,
+        help="Samples graded per judge call with --async-judges (default: 1)"
+    )
+
+    parser.add_argument(
+        "--use-cache",
+        action="store_true",
+        help="Reuse cached workflow outputs and judge scores from earlier runs"
+    )
+    parser.add_argument(
+        "--cache-invalidate",
+        action="store_true",
+        help="Clear cached workflow outputs and judge scores before running"
+    )
+    parser.add_argument(
+        "--responses",
+        type=str,
+        default=None,
+        help="JSON file to save workflow outputs to (read from with --skip-generation)"
+    )
+    parser.add_argument(
+        "--skip-generation",
+        action="store_true",
+        help="Re-judge the outputs in --responses instead of running the workflow"
+    )
+    parser.add_argument(
+        "--debug",
+        action="store_true",
+        help="Log per-judge, per-query and error details (tracebacks) to stderr"
+    )
+
+    return parser
+
+
+def _parse_args() -> argparse.Namespace:
+    """Parse and validate the command line (exits on --help or usage errors)"""
+    parser = _build_parser()
+    args = parser.parse_args()
+
+    if args.skip_generation and not args.responses:
+        parser.error("--skip-generation requires --responses")
+    for flag in ("concurrency", "judge_concurrency", "judge_batch_size"):
+        if getattr(args, flag) < 1:
+            parser.error(f"--{flag.replace('_', '-')} must be at least 1")
+
+    return args
+
+
+# The parser only needs the standard library, so --help and usage errors
+# exit here instead of after the multi-second mlflow/LangGraph imports below
+if __name__ == "__main__":
+    _parse_args()
+
+
 import mlflow
 import mlflow.genai
+from mlflow.entities import Feedback
+from mlflow.genai.scorers import scorer
+import numpy as np
 import pandas as pd
 from dotenv import load_dotenv
 from pymongo import MongoClient
-from openai import OpenAI
+from openai import AsyncOpenAI
 import os
 # Import the system
 from procurement_agent.workflow import ProcurementWorkflow
 from procurement_agent.config import Config
+from procurement_agent.llm_client import get_openai_client
+from procurement_agent.graph.procurement_agent_node import get_mongodb_agent
+from procurement_agent.graph.memory_nodes import get_short_term_memory, get_long_term_memory
+from procurement_agent.graph.guardrails import get_guardrails
+from procurement_agent.mongodb_query import get_collection_schema
+from procurement_agent.prompts.prompts import (
+    SYSTEM_PROMPT as MONGODB_SYSTEM_PROMPT,
+    ROUTER_SYSTEM_PROMPT,
+    CHAT_SYSTEM_PROMPT,
+    RESULTS_EXPLANATION_PROMPT,
+)
 
 import warnings
 import logging
@@ -50,6 +192,219 @@ import logging
 warnings.filterwarnings("ignore", message=".*was created in a different Context.*")
 logging.getLogger("opentelemetry.context").setLevel(logging.CRITICAL)
 
+logger = logging.getLogger(__name__)
+
+# Shared by the query judges so the note is written (and tokenized) once
+DATE_FORMAT_NOTE = (
+    'Dates use the placeholder {"__datetime__": "YYYY-MM-DD"}, e.g. '
+    '{"creation_date": {"$gte": {"__datetime__": "2014-01-01"}}}. It is converted '
+    'before execution and is correct; do not penalize it.'
+)
+
+# Verdict recorded for query judges on samples without a MongoDB query;
+# a None value keeps them out of the criterion averages
+SKIPPED_VERDICT = {"value": None, "rationale": "Skipped: no MongoDB query was generated"}
+
+# Verdict recorded for query judges when the workflow itself failed; scored
+# as 0 so crashed data queries pull the query averages down instead of
+# dropping out of them like chat-only answers
+FAILED_VERDICT = {"value": 0.0, "rationale": "Workflow failed before a MongoDB query was generated"}
+
+# Model behind every judge
+JUDGE_MODEL = "gpt-5"
+
+# Judge calls retry rate limits, timeouts and 5xx errors with the OpenAI SDK's
+# exponential backoff before a criterion is recorded as failed
+JUDGE_MAX_RETRIES = 3
+
+# On-disk cache of workflow outputs, one JSON file per query hash
+EVAL_CACHE_DIR = Path(".eval_cache")
+PREDICTION_CACHE_DIR = EVAL_CACHE_DIR / "predictions"
+
+# Judge score tables keyed by query set, prompts, and models (Arrow/Feather)
+SCORES_CACHE_DIR = EVAL_CACHE_DIR / "scores"
+
+# Single-criterion judge verdicts, one JSON file per (criterion, transcript) hash
+JUDGE_CACHE_DIR = EVAL_CACHE_DIR / "judges"
+
+# Rows per block when averaging judge score columns
+SCORE_CHUNK_ROWS = 65_536
+
+# Category metric -> the criteria whose averages it sums
+CATEGORIES = {
+    "query_generation_out_of_80": ("syntax_correctness", "semantic_correctness", "query_efficiency"),
+    "response_quality_out_of_20": ("natural_language", "relevance"),
+}
+
+# Numbered query lines in the queries file, e.g. "12. Top suppliers by spend";
+# matched across the whole file, [ \t] keeps a match from spanning lines
+QUERY_LINE_RE = re.compile(r"^[ \t]*(\d+)\.[ \t]+(.+?)[ \t]*$", re.MULTILINE)
+
+# Sampled collection schema, refreshed once a day
+SCHEMA_CACHE_FILE = EVAL_CACHE_DIR / "schema.json"
+SCHEMA_CACHE_TTL = 24 * 60 * 60
+
+# Judge rubrics. "{{ inputs }}"/"{{ outputs }}" are filled by the judge
+# runtime; "{schema_header}" is replaced with the collection schema once
+# the framework has loaded it. Placeholders are filled with str.replace,
+# not str.format: the rubrics contain literal JSON braces (see
+# DATE_FORMAT_NOTE) that format() would try to interpret.
+SYNTAX_INSTRUCTIONS = """Score the MongoDB query's syntax, 0-35.
+
+Question: {{ inputs }}
+Query: {{ outputs }}
+
+{schema_header}
+
+Check: valid operators and nesting, field names from the schema, dates as __datetime__ placeholders (penalize ISODate() and other formats), executes without errors.
+35 = valid and executable; 18 = likely execution problems; 0 = broken."""
+
+SEMANTIC_INSTRUCTIONS = """Score how well the MongoDB query answers the question, 0-30.
+
+Question: {{ inputs }}
+Query: {{ outputs }}
+
+""" + DATE_FORMAT_NOTE + """
+
+Check: right fields, filters and operations for the user's intent.
+30 = answers exactly what was asked; 15 = partly misreads the intent; 0 = does not address it."""
+
+EFFICIENCY_INSTRUCTIONS = """Score the MongoDB query's efficiency, 0-15.
+
+Question: {{ inputs }}
+Query: {{ outputs }}
+
+""" + DATE_FORMAT_NOTE + """
+
+Check: $match early, $limit where useful, index-friendly filters, no needless stages.
+15 = highly efficient; 8 = works but could be optimized; 0 = major performance problems."""
+
+NATURAL_LANGUAGE_INSTRUCTIONS = """Score the response's language quality, 0-15.
+
+Response: {{ outputs }}
+
+Check: clear, professional, readable, conversational tone.
+15 = excellent and engaging; 8 = acceptable but robotic; 0 = very poor."""
+
+RELEVANCE_INSTRUCTIONS = """Score how directly the response addresses the question, 0-5.
+
+Question: {{ inputs }}
+Response: {{ outputs }}
+
+5 = focused and fully relevant; 2 = partially relevant; 0 = not relevant."""
+
+# Verdict shape shared by every judge reply format
+JUDGE_VERDICT_FORMAT = '{"score": <integer>, "rationale": "<at most 40 words>"}'
+
+# Structured-output schema for single-criterion judge calls, so the reply is
+# always a parseable verdict without spelling the format out in prose
+JUDGE_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "judge_verdict",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "score": {"type": "integer"},
+                "rationale": {"type": "string"},
+            },
+            "required": ["score", "rationale"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+# (name, instructions template, max points, prediction field shown as
+# "{{ outputs }}") for every judge, in report order
+JUDGE_SPECS = [
+    ("syntax_correctness", SYNTAX_INSTRUCTIONS, 35, "mongodb_query"),
+    ("semantic_correctness", SEMANTIC_INSTRUCTIONS, 30, "mongodb_query"),
+    ("query_efficiency", EFFICIENCY_INSTRUCTIONS, 15, "mongodb_query"),
+    ("natural_language", NATURAL_LANGUAGE_INSTRUCTIONS, 15, "response"),
+    ("relevance", RELEVANCE_INSTRUCTIONS, 5, "response"),
+]
+
+Criterion = namedtuple("Criterion", "name max_points value_col category")
+
+# Criterion -> category metric it counts towards (CATEGORIES inverted)
+CRITERION_CATEGORY = {
+    name: metric_name for metric_name, members in CATEGORIES.items() for name in members
+}
+
+# Per-criterion facts for aggregation, resolved once at import; MLflow GenAI
+# stores scores in columns named "<judge>/value" (not "/score")
+CRITERIA = tuple(
+    Criterion(
+        name,
+        max_points,
+        f"{name}/value",
+        CRITERION_CATEGORY[name],
+    )
+    for name, _, max_points, _ in JUDGE_SPECS
+)
+
+# Points available across all judges
+TOTAL_POINTS = sum(crit.max_points for crit in CRITERIA)
+
+# Score column of every criterion, in CRITERIA order
+CRITERIA_VALUE_COLUMNS = [crit.value_col for crit in CRITERIA]
+
+def _category_slice(metric_name: str) -> slice:
+    """Slice of CRITERIA holding the criteria a category metric sums"""
+    positions = [i for i, crit in enumerate(CRITERIA) if crit.category == metric_name]
+    if positions != list(range(positions[0], positions[-1] + 1)):
+        raise ValueError(f"JUDGE_SPECS must list the {metric_name} criteria next to each other")
+    return slice(positions[0], positions[-1] + 1)
+
+
+# Category metric -> slice of CRITERIA it sums; JUDGE_SPECS lists each
+# category's criteria together, so a total is a plain slice sum (no index copy)
+CATEGORY_SLICES = {metric_name: _category_slice(metric_name) for metric_name in CATEGORIES}
+
+# Where to find per-sample scores, printed after the run ID in one write
+RESULTS_GUIDE_TEXT = "\n".join([
+    "",
+    "To see detailed sample-wise scores:",
+    "   METHOD 1 - Traces Tab (Interactive):",
+    "     1. Click 'Traces' tab in your run",
+    "     2. Click on any trace to expand it",
+    "     3. Scroll down to see 'Assessments' section",
+    f"     4. View all {len(JUDGE_SPECS)} criterion scores with rationales",
+    "",
+    "   METHOD 2 - Artifacts Tab (Reference):",
+    "     1. Click 'Artifacts' tab",
+    "     2. Open 'evaluation_criteria.json' - full scoring system and criteria",
+    "",
+    "",
+])
+
+# Fully static, so the closing summary is assembled once and written in one call
+SUMMARY_TEXT = "\n".join([
+    "",
+    "EVALUATION SUMMARY",
+    "=" * 70,
+    "",
+    "Evaluation complete! Results logged to MLflow.",
+    "",
+    "To view detailed scores:",
+    "  1. Open MLflow UI: http://localhost:5000",
+    "  2. Go to the 'Traces' tab in your run",
+    "  3. View individual scores for each criterion",
+    "  4. Check the 'Metrics' tab for aggregated scores",
+    "",
+    "Judges Executed:",
+    *(
+        f"  - {name.replace('_', ' ').title()} (0-{max_points} points)"
+        for name, _, max_points, _ in JUDGE_SPECS
+    ),
+    "",
+    f"Total Possible: {TOTAL_POINTS} points",
+    "",
+    "=" * 70,
+    "",
+])
+
 
 class EvaluationFramework:
     """
@@ -63,7 +418,8 @@ class EvaluationFramework:
     def __init__(
         self,
         experiment_name: str = "procurement-assistant-evaluation",
-        run_name: Optional[str] = None
+        run_name: Optional[str] = None,
+        use_cache: bool = False
     ):
         # Initialize MLflow
         mlflow.set_experiment(experiment_name)
@@ -73,25 +429,62 @@ class EvaluationFramework:
         mlflow.langchain.autolog()
         mlflow.openai.autolog()
 
+        # One long-lived event loop for all workflow/judge coroutines, so
+        # async HTTP connection pools and tracing context survive across calls
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._loop_thread.start()
+
         # Initialize system
         load_dotenv()
         self.workflow = ProcurementWorkflow()
-        self.openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        # Same client instance the workflow nodes use, so judge and Batch API
+        # calls share their HTTP connection pool
+        self.openai_client = get_openai_client()
+        # Judge view of the shared client: same connection pool, more retries
+        self._judge_openai_client = self.openai_client.with_options(max_retries=JUDGE_MAX_RETRIES)
+        # Async judges reuse one client (created lazily on the event loop)
+        self._async_openai_client: Optional[AsyncOpenAI] = None
+        # Thread pool for the default-path judges (created by _parallel_judge_scorer)
+        self._judge_executor: Optional[ThreadPoolExecutor] = None
 
         # Connect to MongoDB
-        self.mongo_client = MongoClient(Config.MONGO_URI)
+        self.mongo_client = MongoClient(Config.MONGO_URI, **Config.MONGO_CLIENT_OPTIONS)
         self.db = self.mongo_client[Config.MONGO_DB]
         self.collection = self.db[Config.MONGO_COLLECTION]
 
         # Get schema
         self.schema = self._get_schema()
+        # Warm the workflow's data agent with the same schema: it skips its own
+        # collection sampling on every invocation, and its prompt matches the
+        # one fingerprinted for the prediction cache
+        get_mongodb_agent(schema=self.schema)
+        # Same formatting as MongoDBQueryAgent, so the logged prompt matches the one it sends
+        self._schema_str = json.dumps(self.schema, indent=2) if self.schema else "[Schema not available]"
+        # Judges only check field names and types: compact field -> type map,
+        # without the sample values and descriptions repeated in every judge call
+        self._judge_schema_str = (
+            json.dumps({field: info.get("type") for field, info in self.schema.items()}, separators=(',', ':'))
+            if self.schema else "[Schema not available]"
+        )
 
         # Load system prompts
         self.system_prompts = self._load_system_prompts()
+        # Hashed once; every prediction cache key reuses it
+        self._prompt_hash = self._workflow_fingerprint()
 
         # Create judges
         self.judges = self._create_judges()
 
+        # Precomputed predict_fn outputs, keyed by query text
+        self._predictions: Dict[str, Dict] = {}
+
+        # Run-level counters, sent with the aggregated scores in one log_metrics call
+        self._run_metrics: Dict[str, float] = {}
+
+        # Reuse workflow outputs and judge verdicts from earlier runs (see EVAL_CACHE_DIR)
+        self.use_cache = use_cache
+
         # Statistics
         self.token_usage = {
             "total_prompt_tokens": 0,
@@ -99,405 +492,948 @@ class EvaluationFramework:
             "total_tokens": 0,
         }
 
-        print("Evaluation Framework initialized")
-        print(f"Experiment: {experiment_name}")
-        print(f"Run Name: {self.run_name}\n")
+        logger.info("Evaluation Framework initialized (experiment=%s, run=%s)", experiment_name, self.run_name)
+
+    def _run_async(self, coro):
+        """Run a coroutine on the framework's event loop and wait for it"""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def close(self):
+        """Stop the framework's event loop and release its judge threads and MongoDB connections"""
+        if self._judge_executor is not None:
+            self._judge_executor.shutdown(wait=True)
+            self._judge_executor = None
+        if self._loop.is_running():
+            if self._async_openai_client is not None:
+                # Close the judges' HTTP pool on the loop it was opened on
+                asyncio.run_coroutine_threadsafe(
+                    self._async_openai_client.close(), self._loop
+                ).result()
+                self._async_openai_client = None
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop_thread.join()
+        if not self._loop.is_closed():
+            self._loop.close()
+        self.mongo_client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
 
     def _get_schema(self) -> Dict:
-        """Get MongoDB collection schema"""
+        """Get MongoDB collection schema, reusing a recent on-disk copy"""
+        # Hashed so credentials in the URI never land in the cache file
+        cache_key = hashlib.sha256(
+            f"{Config.MONGO_URI}|{Config.MONGO_DB}|{Config.MONGO_COLLECTION}".encode("utf-8")
+        ).hexdigest()
+
+        cached = None
         try:
-            from procurement_agent.mongodb_query import MongoDBQueryAgent
-            agent = MongoDBQueryAgent(
-                mongo_uri=Config.MONGO_URI,
-                db_name=Config.MONGO_DB,
-                collection_name=Config.MONGO_COLLECTION
-            )
-            schema = agent._get_collection_schema()
-            print(f"Loaded schema with {len(schema)} fields")
+            cached = json.loads(SCHEMA_CACHE_FILE.read_text(encoding="utf-8"))
+            if cached.get("key") != cache_key:
+                cached = None
+            elif time.time() - SCHEMA_CACHE_FILE.stat().st_mtime < SCHEMA_CACHE_TTL:
+                schema = cached["schema"]
+                logger.info("Loaded cached schema with %d fields", len(schema))
+                return schema
+        except (OSError, ValueError, KeyError, AttributeError):
+            cached = None
+
+        try:
+            fingerprint = self._schema_fingerprint()
+        except Exception:
+            fingerprint = None
+
+        # Expired but the collection looks unchanged: extend instead of re-sampling
+        if cached and fingerprint and cached.get("fingerprint") == fingerprint:
+            SCHEMA_CACHE_FILE.touch()
+            schema = cached["schema"]
+            logger.info("Revalidated cached schema with %d fields", len(schema))
             return schema
+
+        try:
+            # Sample through the framework's own client instead of building
+            # a second MongoDBQueryAgent (and connection) just for the schema
+            schema = get_collection_schema(self.collection)
+            logger.info("Loaded schema with %d fields", len(schema))
         except Exception as e:
-            print(f"Warning: Schema loading failed: {e}")
+            logger.warning("Schema loading failed: %s", e)
+            logger.debug("Schema loading failure details", exc_info=True)
             return {}
 
+        if schema:
+            SCHEMA_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            SCHEMA_CACHE_FILE.write_text(
+                json.dumps({"key": cache_key, "fingerprint": fingerprint, "schema": schema}),
+                encoding="utf-8"
+            )
+        return schema
+
+    def _schema_fingerprint(self) -> str:
+        """Cheap signature of the collection: document count and one document's fields"""
+        count = self.collection.estimated_document_count()
+        sample = self.collection.find_one() or {}
+        fields = ",".join(sorted(sample))
+        return hashlib.sha256(f"{count}|{fields}".encode("utf-8")).hexdigest()
+
     def _load_system_prompts(self) -> Dict[str, str]:
         """Load all system prompts"""
-        from procurement_agent.prompts.prompts import SYSTEM_PROMPT as MONGODB_SYSTEM_PROMPT
-
         # MongoDB Query Agent prompt with schema filled in
-        schema_str = json.dumps(self.schema, indent=2) if self.schema else "[Schema not available]"
-        mongodb_prompt = MONGODB_SYSTEM_PROMPT.format(schema_context=schema_str)
+        mongodb_prompt = MONGODB_SYSTEM_PROMPT.format(schema_context=self._schema_str)
         return {"mongodb_query_agent": mongodb_prompt}
 
     def _create_judges(self) -> List:
-        """Create MLflow GenAI judges for all 8 criteria"""
+        """Create MLflow GenAI judges for all criteria in JUDGE_SPECS"""
         judges = []
         self.judge_prompts = {}  # Store prompts for logging
+        self.judge_specs = []  # JUDGE_SPECS entries of created judges, schema filled in
+
+        logger.debug("Creating evaluation judges...")
+
+        # Schema + date-format header, built once and embedded only in the
+        # syntax judge (the only one that validates field names)
+        self._schema_header = (
+            f"Available Collection Schema (field: type):\n{self._judge_schema_str}\n\n{DATE_FORMAT_NOTE}"
+        )
+
+        specs = [
+            (name, template.replace("{schema_header}", self._schema_header), max_points, field)
+            for name, template, max_points, field in JUDGE_SPECS
+        ]
+
+        # make_judge may validate against the model, so build them concurrently
+        with ThreadPoolExecutor(max_workers=len(specs)) as executor:
+            futures = {
+                name: executor.submit(
+                    mlflow.genai.make_judge,
+                    name=name,
+                    instructions=instructions,
+                    model=f"openai:/{JUDGE_MODEL}",
+                )
+                for name, instructions, _, _ in specs
+            }
+
+        for name, instructions, max_points, field in specs:
+            try:
+                judges.append(futures[name].result())
+            except Exception as e:
+                logger.warning("%s judge failed: %s", name, e)
+                logger.debug("%s judge failure details", name, exc_info=True)
+                continue
+            self.judge_prompts[name] = instructions
+            self.judge_specs.append((name, instructions, max_points, field))
+            logger.debug("Created %s judge", name)
 
-        print("Creating evaluation judges...")
-
-        # Get schema for syntax validation
-        schema_str = json.dumps(self.schema, indent=2) if self.schema else "[Schema not available]"
+        logger.info("Created %d evaluation judges", len(judges))
+        return judges
 
-        # 1. Syntax Correctness Judge (35 points)
-        try:
-            syntax_instructions = f"""Evaluate MongoDB query syntax correctness.
-
-User Question: {{{{ inputs }}}}
-AI Output: {{{{ outputs }}}}
-
-The output contains a MongoDB query. Evaluate if it has valid syntax and structure.
-
-Available Collection Schema:
-{schema_str}
-
-IMPORTANT - Special Date Format:
-This system uses a special placeholder format for dates: {{"__datetime__": "YYYY-MM-DD"}}
-- This is CORRECT syntax (not an error)
-- The placeholder is converted to Python datetime objects before execution
-- Example: {{"creation_date": {{"$gte": {{"__datetime__": "2014-01-01"}}}}}}
-- Do NOT penalize queries that use this format
-- DO penalize if dates are in wrong format (missing __datetime__, using ISODate(), etc.)
-
-Check:
-- Is it valid MongoDB query syntax?
-- Are all operators used correctly ($match, $group, $sum, $gte, etc.)?
-- Are field names valid according to the schema?
-- Are dates using the correct __datetime__ placeholder format?
-- Is the structure well-formed (proper nesting, brackets, etc.)?
-- Would this query execute without syntax errors (after datetime conversion)?
-
-Score from 0-35:
-- 35 = Perfect syntax: valid, well-formed, correct field names, proper date format, will execute
-- 26 = Mostly correct: minor syntax issues but likely works
-- 18 = Some syntax problems: may have execution issues
-- 9 = Major syntax errors: likely won't execute
-- 0 = Invalid syntax: completely broken
-
-Provide your score (0-35) and rationale."""
-
-            syntax_judge = mlflow.genai.make_judge(
-                name="syntax_correctness", instructions=syntax_instructions, model="openai:/gpt-5"
-            )
-            judges.append(syntax_judge)
-            self.judge_prompts["syntax_correctness"] = syntax_instructions
-        except Exception as e:
-            print(f"  Warning: Syntax judge failed: {e}")
+    def _parallel_judge_scorer(self, judge_concurrency: int = 32):
+        """
+        Wrap all judges in a single scorer that runs them concurrently
 
-        # 2. Semantic Correctness Judge (30 points)
-        try:
-            semantic_instructions = """Evaluate if the MongoDB query semantically matches the user's intent.
+        Each judge is an independent model call, so per sample the judges
+        are submitted to a shared thread pool instead of running one after
+        another. The scorer returns one Feedback per judge, keeping the
+        "<judge>/value" columns of the result DataFrame unchanged. The pool
+        is owned by the framework and shut down in close().
+        """
+        # judges and judge_specs are built in lockstep by _create_judges
+        judges = [(judge, spec[1], spec[3]) for judge, spec in zip(self.judges, self.judge_specs)]
+        if self._judge_executor is None:
+            self._judge_executor = ThreadPoolExecutor(max_workers=judge_concurrency)
+        executor = self._judge_executor
+
+        def run_judge(judge, instructions, field, inputs, outputs):
+            output = self._judge_output(outputs, field)
+            cache_key = self._judge_cache_key(judge.name, instructions, inputs, output)
+            cached = self._load_cached_verdict(judge.name, cache_key)
+            if cached is not None:
+                return Feedback(name=judge.name, value=cached["value"], rationale=cached["rationale"])
+            try:
+                feedback = judge(inputs=inputs, outputs=output)
+            except Exception as e:
+                return Feedback(name=judge.name, error=e)
+            if getattr(feedback, "error", None) is None:
+                self._store_cached_verdict(
+                    judge.name, cache_key,
+                    {"value": feedback.value, "rationale": feedback.rationale}
+                )
+            return feedback
+
+        @scorer(name="judges")
+        def all_judges(inputs, outputs):
+            # The row's inputs dict; judges and the cache key use the query text
+            query = self._query_text(inputs)
+            feedbacks, futures = [], []
+            for judge, instructions, field in judges:
+                preset = self._preset_verdict(field, outputs)
+                if preset is None:
+                    futures.append(executor.submit(run_judge, judge, instructions, field, query, outputs))
+                elif preset["value"] is not None:
+                    feedbacks.append(Feedback(name=judge.name, value=preset["value"], rationale=preset["rationale"]))
+            return feedbacks + [future.result() for future in futures]
+
+        return all_judges
 
-User Question: {{ inputs }}
-AI Output: {{ outputs }}
+    def _register_prompts(self):
+        """Register all prompts to MLflow Prompt Registry"""
+        prompts_registered = []
 
-The output contains a MongoDB query. Evaluate if it correctly addresses what the user asked.
+        # (registry name, template, commit message, tags, label) for every
+        # prompt; agent prompts first, then one entry per created judge
+        prompt_specs = [
+            ("mongodb_query_agent", self.system_prompts["mongodb_query_agent"],
+             "MongoDB query generation prompt with schema",
+             {"agent": "data_agent", "version": "v2.1", "has_schema": "true"}, "MongoDB Query Agent"),
+            ("router_agent", ROUTER_SYSTEM_PROMPT.strip(), "Router agent classification prompt",
+             {"agent": "router", "version": "v2.1", "type": "classification"}, "Router Agent"),
+            ("chat_agent", CHAT_SYSTEM_PROMPT.strip(), "Chat agent conversational prompt",
+             {"agent": "chat", "version": "v2.1", "type": "conversational"}, "Chat Agent"),
+            ("results_explanation", RESULTS_EXPLANATION_PROMPT.strip(), "Results to human language conversion prompt",
+             {"agent": "data_agent", "type": "explanation"}, "Results Explanation"),
+        ]
+        prompt_specs.extend(
+            (f"judge_{judge_name}", judge_prompt, f"{judge_name} evaluation judge prompt",
+             {"type": "judge", "criterion": judge_name}, f"Judge: {judge_name}")
+            for judge_name, judge_prompt in getattr(self, "judge_prompts", {}).items()
+        )
+
+        for name, template, commit_message, tags, label in prompt_specs:
+            try:
+                mlflow.genai.register_prompt(
+                    name=name,
+                    template=template,
+                    commit_message=commit_message,
+                    tags=tags,
+                )
+                prompts_registered.append(label)
+            except Exception:
+                pass  # Already exists
 
-IMPORTANT - Date Format Note:
-This system uses {{"__datetime__": "YYYY-MM-DD"}} as a special placeholder for dates.
-This is the CORRECT format for date queries in this system.
+        if prompts_registered:
+            logger.info("Registered %d prompts to MLflow Prompt Registry", len(prompts_registered))
+        else:
+            logger.warning("No new prompts registered (may already exist)")
 
-Check:
-- Are the correct fields being queried?
-- Are the filters appropriate for the question?
-- Are the operations ($match, $group, $sum, etc.) correct?
-- Does the query structure match the user's intent?
-- For date-related queries: is the __datetime__ placeholder used correctly?
+    def predict_fn(self, inputs: str) -> Dict:
+        """
+        Prediction function for mlflow.genai.evaluate()
 
-Score from 0-30:
-- 30 = Perfect match: query will answer exactly what was asked
-- 23 = Mostly correct: minor semantic issues or field choices
-- 15 = Partially correct: some misunderstanding of intent
-- 8 = Mostly wrong: major semantic issues, wrong fields/operations
-- 0 = Completely wrong: doesn't address the question at all
+        Args:
+            inputs: Query text string (passed as "inputs" parameter)
 
-Provide your score (0-30) and rationale."""
+        Returns:
+            Dict with the generated "mongodb_query" (None for chat-agent
+            answers) and the final "response" text
+        """
+        # inputs is the query text directly
+        query = inputs
 
-            semantic_judge = mlflow.genai.make_judge(
-                name="semantic_correctness",
-                instructions=semantic_instructions,
-                model="openai:/gpt-5",
-            )
-            judges.append(semantic_judge)
-            self.judge_prompts["semantic_correctness"] = semantic_instructions
-        except Exception as e:
-            print(f"  Warning: Semantic judge failed: {e}")
+        # Served from the concurrent pre-pass in run_evaluation when available
+        if query in self._predictions:
+            return self._predictions[query]
 
-        # 3. Query Efficiency Judge (15 points)
-        try:
-            efficiency_instructions = """Evaluate MongoDB query efficiency.
-
-User Query: {{ inputs }}
-AI Output: {{ outputs }}
-
-The output contains a MongoDB query. Evaluate the MONGODB QUERY for efficiency.
-
-IMPORTANT - Special Date Format:
-This system uses a special placeholder format for dates: {"__datetime__": "YYYY-MM-DD"}
-- This is the CORRECT format used by this system
-- The placeholder is converted to Python datetime objects before execution
-- Example: {"creation_date": {"$gte": {"__datetime__": "2014-01-01"}}}
-- Do NOT penalize queries for using this format
-
-Consider:
-- Are $match filters applied early in the pipeline?
-- Is there appropriate use of $limit?
-- Are indexes likely being used (simple filters on key fields)?
-- Is the query unnecessarily complex?
-- For aggregations: is the pipeline well-structured?
-
-Score from 0-15:
-- 15 = Highly efficient: early filters, appropriate limits, index-friendly
-- 12 = Reasonably efficient: good structure, minor optimization opportunities
-- 8 = Moderately efficient: works but could be optimized
-- 4 = Inefficient but functional: performance issues likely
-- 0 = Very inefficient: major performance problems
-
-Provide your score (0-15) and rationale."""
-
-            efficiency_judge = mlflow.genai.make_judge(
-                name="query_efficiency", instructions=efficiency_instructions, model="openai:/gpt-5"
-            )
-            judges.append(efficiency_judge)
-            self.judge_prompts["query_efficiency"] = efficiency_instructions
-        except Exception as e:
-            print(f"  Warning: Efficiency judge failed: {e}")
+        return self._run_async(self._predict_one_async(query))
 
-        # 4. Natural Language Quality Judge (15 points)
-        try:
-            natural_language_instructions = """Evaluate natural language quality.
+    async def _predict_one_async(self, query: str) -> Dict:
+        """Run the workflow for one query and format the output for the judges"""
+        cache_key = self._prediction_cache_key(query)
+        if self.use_cache:
+            cached = self._load_cached_prediction(cache_key)
+            if cached is not None:
+                logger.debug("Cached: %.70s...", query)
+                return cached
 
-Response: {{ outputs }}
+        logger.debug("Processing: %.70s...", query)
 
-Check:
-- Is it conversational and engaging?
-- Clear and professional?
-- Good readability and flow?
-- Appropriate tone?
-
-Score from 0-15:
-- 15 = Excellent natural language, very engaging
-- 11 = Good quality, professional
-- 8 = Acceptable but robotic
-- 4 = Poor quality, hard to read
-- 0 = Very poor language quality
-
-Provide your score (0-15) and rationale."""
-
-            nl_judge = mlflow.genai.make_judge(
-                name="natural_language",
-                instructions=natural_language_instructions,
-                model="openai:/gpt-5",
-            )
-            judges.append(nl_judge)
-            self.judge_prompts["natural_language"] = natural_language_instructions
-            print("  [OK] Natural Language judge")
-        except Exception as e:
-            print(f"  [WARNING] Natural language judge failed: {e}")
+        start_time = time.time()
 
-        # 5. Relevance Judge (5 points)
-        try:
-            relevance_instructions = """Evaluate response relevance to the query.
+        # Run workflow; each query gets its own session so concurrent runs
+        # do not share short-term memory
+        result = await self.workflow.process(
+            user_message=query,
+            session_id=f"eval_{int(time.time())}_{uuid.uuid4().hex[:8]}",
+            user_id="evaluator"
+        )
 
-User Query: {{ inputs }}
-AI Response: {{ outputs }}
+        execution_time = time.time() - start_time
+        logger.debug("Completed in %.2fs: %.70s...", execution_time, query)
 
-Does the response directly address the query without unnecessary information?
+        output = self._format_prediction(result)
 
-Score from 0-5:
-- 5 = Perfectly relevant, focused response
-- 4 = Mostly relevant, minor extra info
-- 2 = Partially relevant
-- 0 = Not relevant
+        # Failed runs are not cached so they are retried next time
+        if self.use_cache and result.get("success"):
+            self._store_cached_prediction(cache_key, output)
 
-Provide your score (0-5) and rationale."""
+        return output
 
-            relevance_judge = mlflow.genai.make_judge(
-                name="relevance", instructions=relevance_instructions, model="openai:/gpt-5"
-            )
-            judges.append(relevance_judge)
-            self.judge_prompts["relevance"] = relevance_instructions
-            print("  [OK] Relevance judge")
-        except Exception as e:
-            print(f"  [WARNING] Relevance judge failed: {e}")
+    @staticmethod
+    def _format_prediction(result: Dict) -> Dict:
+        """Shape a workflow result as the judges' structured "outputs" """
+        # Extract MongoDB query from metadata for judges to evaluate
+        mongodb_query = (result.get('metadata') or {}).get('query')
+
+        # Structured so each judge only sees the field it grades; non-data
+        # queries (chat agent) carry no query, failed runs are flagged so
+        # they are not mistaken for chat answers
+        return {
+            "mongodb_query": mongodb_query or None,
+            "response": result['response'],
+            "has_query": bool(mongodb_query),
+            "error": not result.get("success", True),
+        }
 
-        print(f"\n[OK] Created {len(judges)} evaluation judges\n")
-        return judges
+    @staticmethod
+    def _query_text(inputs) -> str:
+        """Query text of a scorer's inputs ({"inputs": query} row dict or plain text)"""
+        if isinstance(inputs, dict):
+            return str(inputs.get("inputs", ""))
+        return str(inputs)
 
-    def _register_prompts(self):
-        """Register all prompts to MLflow Prompt Registry by importing from source files"""
-        prompts_registered = []
+    @staticmethod
+    def _preset_verdict(field: str, outputs) -> Optional[Dict]:
+        """
+        Verdict decided without a judge call, or None when the judge must run
 
-        # 1. MongoDB Query Agent prompt (already loaded in self.system_prompts)
+        Query judges have nothing to grade without a query: chat-agent
+        answers are skipped (SKIPPED_VERDICT), failed workflow runs score 0
+        (FAILED_VERDICT).
+        """
+        if field != "mongodb_query" or not isinstance(outputs, dict) or outputs.get("has_query"):
+            return None
+        return FAILED_VERDICT if outputs.get("error") else SKIPPED_VERDICT
+
+    @staticmethod
+    def _judge_output(outputs, field: str) -> str:
+        """Select the part of a prediction a judge should see"""
+        value = outputs.get(field) if isinstance(outputs, dict) else outputs
+        if isinstance(value, str):
+            return value
+        # Compact JSON: indentation only adds judge input tokens
+        return json.dumps(value, separators=(',', ':'))
+
+    def _workflow_fingerprint(self) -> str:
+        """Hash of every prompt and model setting that shapes a workflow output"""
+        parts = [
+            self.system_prompts["mongodb_query_agent"],
+            ROUTER_SYSTEM_PROMPT,
+            CHAT_SYSTEM_PROMPT,
+            RESULTS_EXPLANATION_PROMPT,
+            Config.LLM_MODEL,
+        ]
+        return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()
+
+    def _prediction_cache_key(self, query: str) -> str:
+        """Cache key for one query: (query, prompt hash)"""
+        return hashlib.sha256(f"{query}|{self._prompt_hash}".encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _load_cached_prediction(key: str) -> Optional[Dict]:
+        """Return a cached prediction, or None on a miss"""
+        try:
+            cached = json.loads((PREDICTION_CACHE_DIR / f"{key}.json").read_text(encoding="utf-8"))["output"]
+            # Entries from before predictions were structured count as misses
+            return cached if isinstance(cached, dict) else None
+        except (OSError, ValueError, KeyError):
+            return None
+
+    @staticmethod
+    def _store_cached_prediction(key: str, output: Dict):
+        """Persist a prediction for later runs"""
+        # A failed write only costs the cache entry, never the prediction itself
         try:
-            mlflow.genai.register_prompt(
-                name="mongodb_query_agent",
-                template=self.system_prompts["mongodb_query_agent"],
-                commit_message="MongoDB query generation prompt with schema",
-                tags={"agent": "data_agent", "version": "v2.1", "has_schema": "true"},
+            PREDICTION_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            (PREDICTION_CACHE_DIR / f"{key}.json").write_text(
+                json.dumps({"output": output}), encoding="utf-8"
             )
-            prompts_registered.append("MongoDB Query Agent")
-        except Exception as e:
-            pass  # Already exists
-
-        # 2. Router Agent prompt - extract from source file
+        except OSError as e:
+            print(f"  [WARNING] Could not cache workflow output: {e}")
+            logger.debug("Prediction cache failure details", exc_info=True)
+
+    def _scores_cache_key(self, queries_df: pd.DataFrame, scoring: Optional[Dict] = None) -> str:
+        """Cache key covering everything that changes the judge scores"""
+        fingerprint = json.dumps({
+            "scoring": scoring or {},
+            "queries": queries_df["query"].tolist(),
+            "workflow": self._prompt_hash,
+            "judge_model": JUDGE_MODEL,
+            "judge_prompts": getattr(self, "judge_prompts", {}),
+            "failed_verdict": FAILED_VERDICT,
+        }, sort_keys=True)
+        return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _load_cached_scores(key: str) -> Optional[Tuple[pd.DataFrame, Dict[str, Dict]]]:
+        """Return cached judge scores and the predictions they grade, or None on a miss"""
+        path = SCORES_CACHE_DIR / f"{key}.feather"
+        if not path.exists():
+            return None
+        try:
+            predictions = json.loads(path.with_suffix(".json").read_text(encoding="utf-8"))
+            return pd.read_feather(path), predictions
+        except Exception:
+            # Includes entries written before predictions were stored with them
+            return None
+
+    @staticmethod
+    def _store_cached_scores(key: str, df: Optional[pd.DataFrame], predictions: Dict[str, Dict]):
+        """Persist the score columns of an evaluation result, and the predictions they grade, for later runs"""
+        if df is None or df.empty:
+            return
+        # Only the columns the aggregation reads; trace objects do not serialize
+        cols = [
+            c for c in df.columns
+            if c in ("request", "response") or c.endswith(("/value", "/rationale"))
+        ]
+        scores = df[cols].copy()
+        for col in cols:
+            if col.endswith("/value"):
+                scores[col] = pd.to_numeric(scores[col], errors='coerce')
+            else:
+                scores[col] = scores[col].astype("string")
         try:
-            from procurement_agent.graph.router_node import router_node
-            import inspect
-
-            source = inspect.getsource(router_node)
-            # Extract the system prompt from the source code
-            start = source.find('content": """') + len('content": """')
-            end = source.find('"""', start)
-            router_prompt = source[start:end].strip()
-
-            mlflow.genai.register_prompt(
-                name="router_agent",
-                template=router_prompt,
-                commit_message="Router agent classification prompt",
-                tags={"agent": "router", "version": "v2.1", "type": "classification"},
+            SCORES_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            # Predictions first: the table is what marks the entry as present
+            (SCORES_CACHE_DIR / f"{key}.json").write_text(
+                json.dumps(predictions, default=str), encoding="utf-8"
+            )
+            scores.reset_index(drop=True).to_feather(
+                SCORES_CACHE_DIR / f"{key}.feather", compression="zstd"
             )
-            prompts_registered.append("Router Agent")
         except Exception as e:
-            pass  # Already exists or extraction failed
+            print(f"  [WARNING] Could not cache judge scores: {e}")
+            logger.debug("Score cache failure details", exc_info=True)
+
+    @staticmethod
+    def _judge_cache_key(name: str, instructions: str, inputs: str, output: str) -> str:
+        """Cache key for one judge grading one transcript"""
+        fingerprint = "\x00".join((name, JUDGE_MODEL, instructions, inputs, output))
+        return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+
+    def _load_cached_verdict(self, name: str, key: str) -> Optional[Dict]:
+        """Return a cached {"value", "rationale"} verdict, or None on a miss"""
+        if not self.use_cache:
+            return None
+        try:
+            return json.loads((JUDGE_CACHE_DIR / name / f"{key}.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
 
-        # 3. Chat Agent prompt - extract from source file
+    def _store_cached_verdict(self, name: str, key: str, verdict: Dict):
+        """Persist a scored verdict; failed or unparseable ones are retried next run"""
+        if not self.use_cache or verdict.get("value") is None:
+            return
+        # A failed write only costs the cache entry; the verdict is still used
         try:
-            from procurement_agent.graph.chat_agent_node import chat_agent_node
-            import inspect
-
-            source = inspect.getsource(chat_agent_node)
-            # Extract system_prompt variable
-            start = source.find('system_prompt = """') + len('system_prompt = """')
-            end = source.find('"""', start)
-            chat_prompt = source[start:end].strip()
-
-            mlflow.genai.register_prompt(
-                name="chat_agent",
-                template=chat_prompt,
-                commit_message="Chat agent conversational prompt",
-                tags={"agent": "chat", "version": "v2.1", "type": "conversational"},
+            (JUDGE_CACHE_DIR / name).mkdir(parents=True, exist_ok=True)
+            (JUDGE_CACHE_DIR / name / f"{key}.json").write_text(
+                json.dumps({"value": verdict["value"], "rationale": verdict["rationale"]}),
+                encoding="utf-8"
             )
-            prompts_registered.append("Chat Agent")
-        except Exception as e:
-            pass  # Already exists or extraction failed
+        except OSError as e:
+            print(f"  [WARNING] Could not cache {name} verdict: {e}")
+            logger.debug("Verdict cache failure details", exc_info=True)
+
+    @staticmethod
+    def clear_prediction_cache():
+        """Delete all cached predictions, judge verdicts, and judge scores"""
+        for cache_dir in (PREDICTION_CACHE_DIR, SCORES_CACHE_DIR, JUDGE_CACHE_DIR):
+            shutil.rmtree(cache_dir, ignore_errors=True)
+            print(f"Cleared cache: {cache_dir}")
+
+    async def _gather_predictions(self, queries_df: pd.DataFrame, concurrency: int = 16) -> Dict[str, Dict]:
+        """
+        Run the workflow for all queries concurrently
+
+        Args:
+            queries_df: DataFrame from load_queries
+            concurrency: Maximum number of workflow runs in flight
 
-        # 4. Results Explanation prompt - extract from mongodb_query.py
+        Returns:
+            Dict mapping query text to structured prediction
+        """
+        # The workflow nodes create their shared clients lazily and without a
+        # lock; build them once here so concurrent runs cannot each create one
+        get_openai_client()
+        get_short_term_memory()
+        get_long_term_memory()
+        if Config.ENABLE_GUARDRAILS:
+            get_guardrails()
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def bounded(query: str) -> Dict:
+            async with semaphore:
+                return await self._predict_one_async(query)
+
+        # Predictions are keyed by query text, so a query listed twice is run once
+        queries = list(dict.fromkeys(queries_df["query"]))
+        # One failing workflow must not discard the outputs of all the others
+        outputs = await asyncio.gather(*(bounded(query) for query in queries), return_exceptions=True)
+
+        predictions = {}
+        for query, output in zip(queries, outputs):
+            if isinstance(output, Exception):
+                print(f"  [WARNING] Workflow failed for: {query[:70]}... ({output})")
+                output = self._format_prediction({"response": f"Error: {output}", "success": False})
+            predictions[query] = output
+        return predictions
+
+    @staticmethod
+    def _render_judge_prompt(instructions: str, inputs: str, outputs: str) -> str:
+        """Fill a judge template and ask for a machine-readable verdict"""
+        prompt = instructions.replace("{{ inputs }}", inputs).replace("{{ outputs }}", outputs)
+        return (
+            f"{prompt}\n\n"
+            f"Respond only with a JSON object: {JUDGE_VERDICT_FORMAT}"
+        )
+
+    @staticmethod
+    def _parse_judge_response(content: Optional[str]) -> Dict:
+        """Extract score and rationale from a judge reply"""
         try:
-            from procurement_agent.mongodb_query import MongoDBQueryAgent
-            import inspect
-
-            source = inspect.getsource(MongoDBQueryAgent.convert_results_to_human_language_llm)
-            # Extract the system content
-            start = source.find('"content": """') + len('"content": """')
-            end = source.find('"""', start)
-            explanation_prompt = source[start:end].strip()
-
-            mlflow.genai.register_prompt(
-                name="results_explanation",
-                template=explanation_prompt,
-                commit_message="Results to human language conversion prompt",
-                tags={"agent": "data_agent", "type": "explanation"},
+            verdict = json.loads(content or "")
+            return {"value": float(verdict["score"]), "rationale": str(verdict.get("rationale", ""))}
+        except (ValueError, KeyError, TypeError):
+            return {"value": None, "rationale": f"Unparseable judge response: {content!r}"}
+
+    def _render_combined_prompt(self, inputs: str, outputs) -> Tuple[List[str], str]:
+        """
+        Merge every applicable rubric into one prompt for a single judge call
+
+        Returns:
+            The criterion names included (query judges are left out for
+            samples without a query) and the rendered prompt
+        """
+        names, sections = [], []
+        for name, instructions, _, field in self.judge_specs:
+            if self._preset_verdict(field, outputs) is not None:
+                continue
+            rubric = instructions.replace("{{ inputs }}", inputs).replace(
+                "{{ outputs }}", self._judge_output(outputs, field)
             )
-            prompts_registered.append("Results Explanation")
-        except Exception as e:
-            pass  # Already exists or extraction failed
+            names.append(name)
+            sections.append(f"### Criterion: {name}\n{rubric}")
+
+        answer_format = ", ".join(
+            f'"{name}": {JUDGE_VERDICT_FORMAT}' for name in names
+        )
+        prompt = (
+            "Grade the sample below on each criterion independently, "
+            "using only that criterion's rubric.\n\n"
+            + "\n\n".join(sections)
+            + f"\n\nRespond only with a JSON object: {{{answer_format}}}"
+        )
+        return names, prompt
+
+    @classmethod
+    def _parse_combined_response(cls, content: Optional[str], names: List[str]) -> Dict[str, Dict]:
+        """Split a combined judge reply into one verdict per criterion"""
+        try:
+            verdicts = json.loads(content or "")
+        except ValueError:
+            verdicts = None
+        if not isinstance(verdicts, dict):
+            verdicts = {}
+        return {
+            name: cls._parse_judge_response(json.dumps(verdicts[name]))
+            if name in verdicts
+            else {"value": None, "rationale": f"Missing from combined judge response: {content!r}"}
+            for name in names
+        }
+
+    def _combined_judge_scorer(self):
+        """
+        Score all criteria of a sample with one judge call
+
+        The rubrics are merged into a single prompt so each sample costs one
+        model round-trip instead of one per judge. The reply is split back
+        into one Feedback per criterion, keeping the "<judge>/value" columns
+        of the result DataFrame unchanged.
+        """
 
-        # 5. Register all Judge prompts (already stored in self.judge_prompts)
-        if hasattr(self, "judge_prompts") and self.judge_prompts:
-            for judge_name, judge_prompt in self.judge_prompts.items():
+        @scorer(name="combined_judge")
+        def combined_judge(inputs, outputs):
+            # The row's inputs dict; the rubrics are filled with the query text
+            names, prompt = self._render_combined_prompt(self._query_text(inputs), outputs)
+            # Failed workflow runs: query criteria are scored 0 without a call
+            preset = []
+            for name, _, _, field in self.judge_specs:
+                verdict = self._preset_verdict(field, outputs)
+                if verdict is not None and verdict["value"] is not None:
+                    preset.append(Feedback(name=name, value=verdict["value"], rationale=verdict["rationale"]))
+            if not names:
+                return preset
+            try:
+                response = self._judge_openai_client.chat.completions.create(
+                    model=JUDGE_MODEL,
+                    messages=[{"role": "user", "content": prompt}],
+                    response_format={"type": "json_object"},
+                )
+            except Exception as e:
+                return preset + [Feedback(name=name, error=e) for name in names]
+
+            verdicts = self._parse_combined_response(response.choices[0].message.content, names)
+            return preset + [
+                Feedback(name=name, value=verdict["value"], rationale=verdict["rationale"])
+                if verdict["value"] is not None
+                else Feedback(name=name, error=ValueError(verdict["rationale"]))
+                for name, verdict in verdicts.items()
+            ]
+
+        return combined_judge
+
+    async def _score_sample(
+        self,
+        client: AsyncOpenAI,
+        semaphore: asyncio.Semaphore,
+        inputs: str,
+        outputs: Dict
+    ) -> Dict[str, Dict]:
+        """Run every judge on one sample concurrently"""
+
+        async def judge(name: str, instructions: str, field: str) -> Dict:
+            preset = self._preset_verdict(field, outputs)
+            if preset is not None:
+                return preset
+            output = self._judge_output(outputs, field)
+            cache_key = self._judge_cache_key(name, instructions, inputs, output)
+            cached = self._load_cached_verdict(name, cache_key)
+            if cached is not None:
+                return cached
+            async with semaphore:
                 try:
-                    mlflow.genai.register_prompt(
-                        name=f"judge_{judge_name}",
-                        template=judge_prompt,
-                        commit_message=f"{judge_name} evaluation judge prompt",
-                        tags={"type": "judge", "criterion": judge_name},
+                    response = await client.chat.completions.create(
+                        model=JUDGE_MODEL,
+                        messages=[{
+                            "role": "user",
+                            "content": self._render_judge_prompt(instructions, inputs, output)
+                        }],
+                        response_format=JUDGE_RESPONSE_FORMAT,
                     )
-                    prompts_registered.append(f"Judge: {judge_name}")
+                    verdict = self._parse_judge_response(response.choices[0].message.content)
                 except Exception as e:
-                    pass  # Already exists
+                    return {"value": None, "rationale": f"Judge call failed: {e}"}
+            self._store_cached_verdict(name, cache_key, verdict)
+            return verdict
 
-        if prompts_registered:
-            print(f"[OK] Registered {len(prompts_registered)} prompts to MLflow Prompt Registry")
-        else:
-            print("[WARNING] No new prompts registered (may already exist)")
+        verdicts = await asyncio.gather(
+            *(judge(name, instructions, field) for name, instructions, _, field in self.judge_specs)
+        )
+        return {spec[0]: verdict for spec, verdict in zip(self.judge_specs, verdicts)}
 
-    def predict_fn(self, inputs: str) -> str:
+    async def _score_predictions(
+        self,
+        predictions: Dict[str, Dict],
+        concurrency: int = 32,
+        batch_size: int = 1
+    ) -> pd.DataFrame:
         """
-        Prediction function for mlflow.genai.evaluate()
+        Score all predictions with AsyncOpenAI instead of mlflow.genai judges
 
         Args:
-            inputs: Query text string (passed as "inputs" parameter)
+            predictions: Dict mapping query text to structured prediction
+            concurrency: Maximum number of judge calls in flight
+            batch_size: Samples graded per judge call; above 1 the rubric
+                prompt is sent once for a whole batch of samples
 
         Returns:
-            AI response string with MongoDB query context embedded
+            DataFrame with the same "<judge>/value" and "<judge>/rationale"
+            columns as mlflow.genai.evaluate() result_df
         """
-        # inputs is the query text directly
-        query = inputs
+        if self._async_openai_client is None:
+            self._async_openai_client = AsyncOpenAI(
+                api_key=os.getenv("OPENAI_API_KEY"),
+                max_retries=JUDGE_MAX_RETRIES,
+            )
+        client = self._async_openai_client
+        semaphore = asyncio.Semaphore(concurrency)
+
+        if batch_size > 1:
+            verdicts_by_query = await self._score_batched(client, semaphore, predictions, batch_size)
+            return self._build_scores_df(predictions, verdicts_by_query)
+
+        queries = list(predictions)
+        scored = await asyncio.gather(
+            *(self._score_sample(client, semaphore, query, predictions[query]) for query in queries)
+        )
+
+        return self._build_scores_df(predictions, dict(zip(queries, scored)))
+
+    @staticmethod
+    def _render_batched_prompt(instructions: str, items: List[Dict]) -> str:
+        """Fill a judge template for a list of samples graded in one call"""
+        rubric = instructions.replace("{{ inputs }}", "<the item's question>").replace(
+            "{{ outputs }}", "<the item's output>"
+        )
+        return (
+            f"{rubric}\n\n"
+            "Grade each item below independently with this rubric.\n"
+            f"ITEMS:\n{json.dumps(items, separators=(',', ':'))}\n\n"
+            'Respond only with a JSON object: {"results": '
+            '[{"id": <item id>, ' + JUDGE_VERDICT_FORMAT[1:] + ', ...]}'
+        )
+
+    @classmethod
+    def _parse_batched_response(cls, content: Optional[str], count: int) -> List[Dict]:
+        """Split a batched judge reply into one verdict per item, in item order"""
+        try:
+            results = json.loads(content or "").get("results")
+            by_id = {int(result["id"]): result for result in results}
+        except (ValueError, KeyError, TypeError, AttributeError):
+            by_id = {}
+        return [
+            cls._parse_judge_response(json.dumps(by_id[item_id]))
+            if item_id in by_id
+            else {"value": None, "rationale": f"Missing from batched judge response: {content!r}"}
+            for item_id in range(count)
+        ]
+
+    async def _score_batched(
+        self,
+        client: AsyncOpenAI,
+        semaphore: asyncio.Semaphore,
+        predictions: Dict[str, Dict],
+        batch_size: int
+    ) -> Dict[str, Dict[str, Dict]]:
+        """Run each judge over batches of samples, one call per batch"""
+        queries = list(predictions)
+        verdicts_by_query: Dict[str, Dict[str, Dict]] = {query: {} for query in queries}
+
+        async def judge_batch(name: str, instructions: str, field: str, batch: List[str]):
+            items = [
+                {"id": i, "question": query, "output": self._judge_output(predictions[query], field)}
+                for i, query in enumerate(batch)
+            ]
+            async with semaphore:
+                try:
+                    response = await client.chat.completions.create(
+                        model=JUDGE_MODEL,
+                        messages=[{"role": "user", "content": self._render_batched_prompt(instructions, items)}],
+                        response_format={"type": "json_object"},
+                    )
+                    verdicts = self._parse_batched_response(response.choices[0].message.content, len(batch))
+                except Exception as e:
+                    verdicts = [{"value": None, "rationale": f"Judge call failed: {e}"}] * len(batch)
+            for query, verdict in zip(batch, verdicts):
+                verdicts_by_query[query][name] = verdict
+
+        calls = []
+        for name, instructions, _, field in self.judge_specs:
+            graded = []
+            for query in queries:
+                preset = self._preset_verdict(field, predictions[query])
+                if preset is not None:
+                    verdicts_by_query[query][name] = preset
+                else:
+                    graded.append(query)
+            calls += [
+                judge_batch(name, instructions, field, graded[i:i + batch_size])
+                for i in range(0, len(graded), batch_size)
+            ]
 
-        print(f"\nProcessing: {query[:70]}...")
+        await asyncio.gather(*calls)
+        return verdicts_by_query
 
-        start_time = time.time()
+    def _run_judges_batch(self, predictions: Dict[str, Dict], poll_interval: int = 30) -> pd.DataFrame:
+        """
+        Score all predictions through the OpenAI Batch API
 
-        # Run workflow
-        result = asyncio.run(self.workflow.process(
-            user_message=query,
-            session_id=f"eval_{int(time.time())}",
-            user_id="evaluator"
-        ))
+        One request per (sample, judge) pair is uploaded as a single JSONL
+        file; the call blocks until the batch finishes (up to 24h). Verdicts
+        already in the judge cache are reused and not resubmitted.
 
-        execution_time = time.time() - start_time
-        print(f"  Completed in {execution_time:.2f}s")
+        Args:
+            predictions: Dict mapping query text to structured prediction
+            poll_interval: Seconds between batch status checks
 
-        # Extract MongoDB query from metadata for judges to evaluate
-        mongodb_query = result.get('metadata', {}).get('query', {})
-        response_text = result['response']
+        Returns:
+            DataFrame in the same format as _score_predictions
+        """
+        queries = list(predictions)
+        verdicts_by_query: Dict[str, Dict[str, Dict]] = {query: {} for query in queries}
+        cache_keys: Dict[str, str] = {}  # custom_id -> judge cache key
+        lines = []
+        for row_id, query in enumerate(queries):
+            for name, instructions, _, field in self.judge_specs:
+                preset = self._preset_verdict(field, predictions[query])
+                if preset is not None:
+                    verdicts_by_query[query][name] = preset
+                    continue
+                output = self._judge_output(predictions[query], field)
+                cache_key = self._judge_cache_key(name, instructions, query, output)
+                cached = self._load_cached_verdict(name, cache_key)
+                if cached is not None:
+                    verdicts_by_query[query][name] = cached
+                    continue
+                custom_id = f"{row_id}:{name}"
+                cache_keys[custom_id] = cache_key
+                lines.append(json.dumps({
+                    "custom_id": custom_id,
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": JUDGE_MODEL,
+                        "messages": [{
+                            "role": "user",
+                            "content": self._render_judge_prompt(instructions, query, output)
+                        }],
+                        "response_format": JUDGE_RESPONSE_FORMAT,
+                    },
+                }))
+
+        if not lines:
+            print("All judge verdicts served from cache; no batch submitted")
+            return self._build_scores_df(predictions, verdicts_by_query)
+
+        batch_file = self._judge_openai_client.files.create(
+            file=("judge_batch.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch"
+        )
+        batch = self._judge_openai_client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        print(f"Submitted judge batch {batch.id} with {len(lines)} requests")
+
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(poll_interval)
+            batch = self._judge_openai_client.batches.retrieve(batch.id)
+            print(f"  Batch {batch.id}: {batch.status}")
+
+        if batch.output_file_id:
+            output = self._judge_openai_client.files.content(batch.output_file_id).text
+            for line in output.splitlines():
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                row_id, name = record["custom_id"].split(":", 1)
+                body = (record.get("response") or {}).get("body") or {}
+                choices = body.get("choices") or [{}]
+                content = choices[0].get("message", {}).get("content")
+                verdict = self._parse_judge_response(content)
+                verdicts_by_query[queries[int(row_id)]][name] = verdict
+                self._store_cached_verdict(name, cache_keys[record["custom_id"]], verdict)
+
+        if batch.status != "completed":
+            print(f"  [WARNING] Judge batch ended with status '{batch.status}'")
+
+        return self._build_scores_df(predictions, verdicts_by_query)
+
+    def _build_scores_df(
+        self,
+        predictions: Dict[str, Dict],
+        verdicts_by_query: Dict[str, Dict[str, Dict]]
+    ) -> pd.DataFrame:
+        """Shape judge verdicts like mlflow.genai.evaluate() result_df"""
+        # Column names built once, not per row
+        columns = [
+            (name, f"{name}/value", f"{name}/rationale") for name, _, _, _ in self.judge_specs
+        ]
+        rows = []
+        for query, verdicts in verdicts_by_query.items():
+            row = {"request": query, "response": predictions[query]}
+            for name, value_col, rationale_col in columns:
+                verdict = verdicts.get(name) or {"value": None, "rationale": "No judge response"}
+                row[value_col] = verdict["value"]
+                row[rationale_col] = verdict["rationale"]
+            rows.append(row)
+        header = ["request", "response"]
+        for _, value_col, rationale_col in columns:
+            header += [value_col, rationale_col]
+        df = pd.DataFrame(rows, columns=header)
+        # Scores typed as float64 once here (None -> NaN), so aggregation and
+        # the score cache reduce them directly instead of re-parsing objects
+        for _, value_col, _ in columns:
+            df[value_col] = pd.to_numeric(df[value_col], errors='coerce').astype(np.float64)
+        return df
+
+    @staticmethod
+    def iter_queries(file_path: str) -> Iterator[Dict]:
+        """Yield evaluation queries from file one at a time"""
+        # One regex scan over the file; finditer is lazy, so a --sample limit
+        # still stops matching early
+        with open(file_path, 'r') as f:
+            content = f.read()
 
-        # Return structured response that includes both the query and response
-        # This allows judges to evaluate the MongoDB query directly
-        if mongodb_query:
-            return f"""MONGODB_QUERY: {json.dumps(mongodb_query, indent=2)}
+        for match in QUERY_LINE_RE.finditer(content):
+            query_text = match[2]
 
-RESPONSE: {response_text}"""
-        else:
-            # For non-data queries (chat agent), just return response
-            return response_text
+            # The 'inputs' dict keys must match predict_fn parameter names
+            # Since predict_fn has parameter "inputs", the dict key is also "inputs"
+            yield {
+                "id": int(match[1]),
+                "query": query_text,
+                "inputs": {"inputs": query_text}  # Key "inputs" matches param name
+            }
 
-    def load_queries(self, file_path: str) -> pd.DataFrame:
+    def load_queries(self, file_path: str, limit: Optional[int] = None) -> pd.DataFrame:
         """Load evaluation queries from file
 
         Returns DataFrame with 'inputs' column containing a dict where keys
         match the predict_fn parameter names (in this case "inputs")
-        """
-        queries = []
 
-        with open(file_path, 'r') as f:
-            content = f.read()
-
-        lines = content.split('\n')
-
-        for line in lines:
-            line = line.strip()
-            if not line or line.startswith('###'):
-                continue
-
-            if line and line[0].isdigit() and '. ' in line:
-                query_text = line.split('. ', 1)[1] if '. ' in line else line
-                query_number = int(line.split('.')[0])
-
-                # The 'inputs' dict keys must match predict_fn parameter names
-                # Since predict_fn has parameter "inputs", the dict key is also "inputs"
-                queries.append({
-                    "id": query_number,
-                    "query": query_text,
-                    "inputs": {"inputs": query_text}  # Key "inputs" matches param name
-                })
+        Args:
+            file_path: Path to queries file
+            limit: Stop reading after this many queries
+        """
+        queries = self.iter_queries(file_path)
+        if limit:
+            queries = itertools.islice(queries, limit)
+        return pd.DataFrame.from_records(queries, columns=["id", "query", "inputs"])
+
+    @staticmethod
+    def save_responses(queries_df: pd.DataFrame, predictions: Dict[str, Dict], file_path: str):
+        """Write workflow outputs so they can be re-judged without re-running"""
+        records = [
+            {"id": int(query_id), "query": query, **predictions[query]}
+            for query_id, query in zip(queries_df["id"], queries_df["query"])
+        ]
+        path = Path(file_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(records, indent=2, default=str), encoding="utf-8")
+        print(f"Saved {len(records)} responses to {path}")
+
+    @staticmethod
+    def load_responses(file_path: str) -> Tuple[pd.DataFrame, Dict[str, Dict]]:
+        """Load outputs written by save_responses
 
-        return pd.DataFrame(queries)
+        Returns:
+            DataFrame shaped like load_queries, and a dict mapping query text
+            to structured prediction
+        """
+        records = json.loads(Path(file_path).read_text(encoding="utf-8"))
+        queries_df = pd.DataFrame.from_records([
+            {"id": r["id"], "query": r["query"], "inputs": {"inputs": r["query"]}}
+            for r in records
+        ])
+        predictions = {
+            r["query"]: {
+                "mongodb_query": r.get("mongodb_query"),
+                "response": r["response"],
+                "has_query": bool(r.get("mongodb_query")),
+                "error": bool(r.get("error")),
+            }
+            for r in records
+        }
+        print(f"Loaded {len(records)} stored responses from {file_path}")
+        return queries_df, predictions
 
     def run_evaluation(
         self,
         queries_file: str = "evaluate.txt",
-        sample_size: Optional[int] = None
+        sample_size: Optional[int] = None,
+        concurrency: int = 16,
+        async_judges: bool = False,
+        judge_concurrency: int = 32,
+        batch_judges: bool = False,
+        combined_judge: bool = False,
+        judge_batch_size: int = 1,
+        responses_file: Optional[str] = None,
+        skip_generation: bool = False
     ):
         """
         Run unified evaluation using MLflow GenAI pipeline with detailed judges
@@ -505,6 +1441,16 @@ RESPONSE: {response_text}"""
         Args:
             queries_file: Path to queries file
             sample_size: Optional limit on number of queries to evaluate
+            concurrency: Maximum number of workflow runs in flight
+            async_judges: Score with AsyncOpenAI instead of mlflow.genai judges
+            judge_concurrency: Maximum number of async judge calls in flight
+            batch_judges: Score through the OpenAI Batch API (offline, ~50% cheaper)
+            combined_judge: Score all criteria of a sample with one judge call
+            judge_batch_size: Samples graded per judge call with async_judges
+            responses_file: JSON file the workflow outputs are written to, or
+                read from with skip_generation
+            skip_generation: Re-judge the responses in responses_file instead
+                of running the workflow (queries_file is ignored)
         """
         print("=" * 70)
         print("UNIFIED PROCUREMENT ASSISTANT EVALUATION")
@@ -512,10 +1458,15 @@ RESPONSE: {response_text}"""
         print("MLflow Experiment: procurement-assistant-evaluation")
         print(f"Run Name: {self.run_name}\n")
 
-        # Load queries
-        queries_df = self.load_queries(queries_file)
-        if sample_size:
-            queries_df = queries_df.head(sample_size)
+        # Load queries (and, when re-judging, their stored responses)
+        stored_responses = None
+        if skip_generation:
+            queries_df, stored_responses = self.load_responses(responses_file)
+            if sample_size:
+                queries_df = queries_df.head(sample_size)
+        else:
+            # --sample stops reading the file early instead of trimming afterwards
+            queries_df = self.load_queries(queries_file, limit=sample_size)
 
         print(f"Loaded {len(queries_df)} evaluation queries\n")
 
@@ -526,16 +1477,18 @@ RESPONSE: {response_text}"""
         with mlflow.start_run(run_name=self.run_name) as run:
             print(f"MLflow Run ID: {run.info.run_id}\n")
 
-            # Log parameters
-            mlflow.log_param("total_queries", len(queries_df))
-            mlflow.log_param("evaluation_date", datetime.now().isoformat())
-            mlflow.log_param("model", "gpt-5")
-            mlflow.log_param("criteria_count", 8)
+            # Log parameters (one tracking-server round-trip)
+            mlflow.log_params({
+                "total_queries": len(queries_df),
+                "evaluation_date": datetime.now().isoformat(),
+                "model": "gpt-5",
+                "criteria_count": 8,
+                "schema_fields": len(self.schema) if self.schema else 0,
+            })
 
             # Log schema
             if self.schema:
                 mlflow.log_dict(self.schema, "mongodb_schema.json")
-                mlflow.log_param("schema_fields", len(self.schema))
                 print(f"Logged schema with {len(self.schema)} fields")
 
             # Log system prompts as artifacts
@@ -552,11 +1505,35 @@ RESPONSE: {response_text}"""
             print("RUNNING EVALUATION")
             print("=" * 70 + "\n")
 
-            results = mlflow.genai.evaluate(
-                data=queries_df,
-                predict_fn=self.predict_fn,
-                scorers=self.judges if self.judges else []
-            )
+            # Judge scores for this exact query set, prompts, and models are
+            # reused from the last run instead of re-invoking every judge
+            scoring = {
+                "combined_judge": combined_judge,
+                "judge_batch_size": judge_batch_size if async_judges else 1,
+            }
+            if skip_generation:
+                # Stored responses stand in for the workflow prompts
+                scoring["responses"] = hashlib.sha256(Path(responses_file).read_bytes()).hexdigest()
+            scores_key = self._scores_cache_key(queries_df, scoring) if self.use_cache else None
+            cached = self._load_cached_scores(scores_key) if scores_key else None
+            if cached is not None:
+                cached_scores, self._predictions = cached
+                print(f"Reusing cached judge scores for {len(cached_scores)} queries (drop --use-cache to re-run)")
+                # Same counters and responses file as the run that produced the scores
+                self._record_prediction_counts()
+                if responses_file and not skip_generation:
+                    self.save_responses(queries_df, self._predictions, responses_file)
+                mlflow.log_table(cached_scores, "judge_scores.json")
+                results = SimpleNamespace(result_df=cached_scores)
+            else:
+                results = self._run_scoring(
+                    queries_df, concurrency, async_judges, judge_concurrency, batch_judges,
+                    combined_judge, judge_batch_size,
+                    predictions=stored_responses,
+                    responses_file=None if skip_generation else responses_file
+                )
+                if scores_key:
+                    self._store_cached_scores(scores_key, getattr(results, 'result_df', None), self._predictions)
 
             print("\n" + "=" * 70)
             print("EVALUATION COMPLETE")
@@ -571,69 +1548,126 @@ RESPONSE: {response_text}"""
             # Print summary
             self._print_summary(results)
 
-            print("\nView results: http://localhost:5000")
-            print(f"Run ID: {run.info.run_id}")
-            print("\nTo see detailed sample-wise scores:")
-            print("   METHOD 1 - Traces Tab (Interactive):")
-            print("     1. Click 'Traces' tab in your run")
-            print("     2. Click on any trace to expand it")
-            print("     3. Scroll down to see 'Assessments' section")
-            print("     4. View all 8 criterion scores with rationales")
-            print("")
-            print("   METHOD 2 - Artifacts Tab (Reference):")
-            print("     1. Click 'Artifacts' tab")
-            print("     2. Open 'evaluation_criteria.json' - full scoring system and criteria\n")
+            sys.stdout.write(
+                f"\nView results: http://localhost:5000\nRun ID: {run.info.run_id}\n{RESULTS_GUIDE_TEXT}"
+            )
+            sys.stdout.flush()
 
         return results
 
-    def _log_system_prompts(self):
-        """Log system prompts as artifacts"""
-        if not self.system_prompts:
-            return
-
-        import tempfile
-        import shutil
+    def _record_prediction_counts(self):
+        """Report and record samples without a query and failed workflow runs"""
+        # Chat-agent answers carry no query, so every scoring mode leaves the
+        # query judges out for them; failed workflow runs score 0 on them
+        # instead. Both are recorded so neither is hidden in the averages.
+        failed = sum(1 for prediction in self._predictions.values() if prediction.get("error"))
+        without_query = sum(
+            1 for prediction in self._predictions.values()
+            if not prediction.get("has_query") and not prediction.get("error")
+        )
+        if without_query:
+            print(f"Skipping query judges for {without_query} samples without a MongoDB query")
+        if failed:
+            print(f"  [WARNING] {failed} workflow runs failed; their query criteria score 0")
+        self._run_metrics["samples_without_query"] = without_query
+        self._run_metrics["workflow_failures"] = failed
+
+    def _run_scoring(
+        self,
+        queries_df: pd.DataFrame,
+        concurrency: int,
+        async_judges: bool,
+        judge_concurrency: int,
+        batch_judges: bool,
+        combined_judge: bool = False,
+        judge_batch_size: int = 1,
+        predictions: Optional[Dict[str, Dict]] = None,
+        responses_file: Optional[str] = None
+    ):
+        """
+        Run the workflow for every query and score the outputs with the judges
 
-        temp_dir = tempfile.mkdtemp()
-        prompts_dir = Path(temp_dir) / "system_prompts"
-        prompts_dir.mkdir(exist_ok=True)
+        When stored predictions are given the workflow is skipped and only
+        the judges run; otherwise fresh outputs are written to responses_file
+        (if set) so they can be re-judged later.
+        """
+        # Longest queries first so they do not tail-stall each concurrent
+        # wave; reporting below goes back to the file order
+        dispatch_df = (
+            queries_df.assign(_len=queries_df["query"].str.len())
+            .sort_values("_len", ascending=False, kind="stable")
+            .drop(columns=["_len"])
+        )
+
+        if predictions is not None:
+            print(f"Re-judging {len(queries_df)} stored responses (workflow skipped)...")
+            self._predictions = {query: predictions[query] for query in queries_df["query"]}
+        else:
+            # Run all workflows up front so OpenAI/MongoDB round-trips overlap;
+            # predict_fn then serves the precomputed outputs
+            print(f"Running workflow for {len(queries_df)} queries (concurrency={concurrency})...")
+            self._predictions = self._run_async(self._gather_predictions(dispatch_df, concurrency))
+            if responses_file:
+                self.save_responses(queries_df, self._predictions, responses_file)
+
+        self._record_prediction_counts()
+
+        if batch_judges or async_judges:
+            if batch_judges:
+                # Offline OpenAI Batch API scoring: cheaper, may take hours
+                print("Scoring with OpenAI Batch API judges...")
+                result_df = self._run_judges_batch(self._predictions)
+            else:
+                # Direct AsyncOpenAI scoring: all judges for all samples overlap
+                print(f"Scoring with async judges (concurrency={judge_concurrency}, batch size={judge_batch_size})...")
+                result_df = self._run_async(
+                    self._score_predictions(self._predictions, judge_concurrency, judge_batch_size)
+                )
+
+            file_order = {query: i for i, query in enumerate(queries_df["query"])}
+            result_df = result_df.sort_values(
+                "request", key=lambda column: column.map(file_order)
+            ).reset_index(drop=True)
+            mlflow.log_table(result_df, "judge_scores.json")
+            results = SimpleNamespace(result_df=result_df)
+        else:
+            if not self.judges:
+                scorers = []
+            elif combined_judge:
+                print("Scoring with one combined judge call per sample...")
+                scorers = [self._combined_judge_scorer()]
+            else:
+                scorers = [self._parallel_judge_scorer(judge_concurrency)]
+            results = mlflow.genai.evaluate(
+                data=dispatch_df,
+                predict_fn=self.predict_fn,
+                scorers=scorers
+            )
 
-        for agent_name, prompt in self.system_prompts.items():
-            prompt_file = prompts_dir / f"{agent_name}.txt"
-            prompt_file.write_text(prompt)
+        return results
 
-        all_prompts_file = prompts_dir / "all_prompts.json"
-        all_prompts_file.write_text(json.dumps(self.system_prompts, indent=2))
+    @staticmethod
+    def _log_prompt_set(prompts: Dict[str, str], folder: str, index_file: str):
+        """Log each prompt as a text artifact plus one combined JSON index"""
+        # Logged straight from memory, no temp directory round-trip
+        for name, prompt in prompts.items():
+            mlflow.log_text(prompt, f"{folder}/{name}.txt")
+        mlflow.log_dict(prompts, f"{folder}/{index_file}")
 
-        mlflow.log_artifacts(str(prompts_dir), "system_prompts")
-        shutil.rmtree(temp_dir)
+    def _log_system_prompts(self):
+        """Log system prompts as artifacts"""
+        if not self.system_prompts:
+            return
 
+        self._log_prompt_set(self.system_prompts, "system_prompts", "all_prompts.json")
         print(f"Logged {len(self.system_prompts)} system prompts\n")
 
     def _log_judge_prompts(self):
         """Log judge prompts as artifacts"""
-        if not hasattr(self, 'judge_prompts') or not self.judge_prompts:
+        if not getattr(self, 'judge_prompts', None):
             return
 
-        import tempfile
-        import shutil
-
-        temp_dir = tempfile.mkdtemp()
-        judge_prompts_dir = Path(temp_dir) / "judge_prompts"
-        judge_prompts_dir.mkdir(exist_ok=True)
-
-        # Log individual judge prompts as txt files
-        for judge_name, prompt in self.judge_prompts.items():
-            prompt_file = judge_prompts_dir / f"{judge_name}.txt"
-            prompt_file.write_text(prompt)
-
-        # Log combined JSON file
-        all_judges_file = judge_prompts_dir / "all_judges.json"
-        all_judges_file.write_text(json.dumps(self.judge_prompts, indent=2))
-
-        mlflow.log_artifacts(str(judge_prompts_dir), "judge_prompts")
-        shutil.rmtree(temp_dir)
-
+        self._log_prompt_set(self.judge_prompts, "judge_prompts", "all_judges.json")
         print(f"Logged {len(self.judge_prompts)} judge prompts\n")
 
     def _log_evaluation_criteria(self):
@@ -641,7 +1675,7 @@ RESPONSE: {response_text}"""
         criteria = {
             "evaluation_framework": {
                 "name": "Unified Procurement Assistant Evaluation",
-                "total_points": 100,
+                "total_points": TOTAL_POINTS,
                 "description": "Comprehensive evaluation across 5 criteria covering query generation and response quality. Judges evaluate the actual MongoDB query (not just the response) for query-related criteria.",
             },
             "categories": [
@@ -712,35 +1746,12 @@ RESPONSE: {response_text}"""
             },
             "judges": [
                 {
-                    "name": "syntax_correctness",
-                    "type": "mlflow.genai.make_judge",
-                    "model": "openai:/gpt-5",
-                    "max_points": 35,
-                },
-                {
-                    "name": "semantic_correctness",
-                    "type": "mlflow.genai.make_judge",
-                    "model": "openai:/gpt-5",
-                    "max_points": 30,
-                },
-                {
-                    "name": "query_efficiency",
-                    "type": "mlflow.genai.make_judge",
-                    "model": "openai:/gpt-5",
-                    "max_points": 15,
-                },
-                {
-                    "name": "natural_language",
-                    "type": "mlflow.genai.make_judge",
-                    "model": "openai:/gpt-5",
-                    "max_points": 15,
-                },
-                {
-                    "name": "relevance",
+                    "name": name,
                     "type": "mlflow.genai.make_judge",
-                    "model": "openai:/gpt-5",
-                    "max_points": 5,
-                },
+                    "model": f"openai:/{JUDGE_MODEL}",
+                    "max_points": max_points,
+                }
+                for name, _, max_points, _ in JUDGE_SPECS
             ],
             "metadata": {
                 "framework": "MLflow GenAI",
@@ -748,17 +1759,10 @@ RESPONSE: {response_text}"""
                 "evaluation_type": "unified",
                 "date_created": datetime.now().isoformat(),
                 "evaluation_approach": {
-                    "description": "Judges receive both MongoDB query and final response for comprehensive evaluation",
-                    "output_format": "MONGODB_QUERY: {json}\\n\\nRESPONSE: {text}",
-                    "query_judges": [
-                        "syntax_correctness",
-                        "semantic_correctness",
-                        "query_efficiency",
-                    ],
-                    "response_judges": [
-                        "natural_language",
-                        "relevance",
-                    ],
+                    "description": "Query judges receive only the MongoDB query; response judges receive only the final response",
+                    "output_format": {"mongodb_query": "{json} | null", "response": "{text}"},
+                    "query_judges": [name for name, _, _, field in JUDGE_SPECS if field == "mongodb_query"],
+                    "response_judges": [name for name, _, _, field in JUDGE_SPECS if field == "response"],
                 },
             },
         }
@@ -776,6 +1780,36 @@ RESPONSE: {response_text}"""
         # - evaluation_criteria.json: Scoring system documentation
         pass
 
+    @staticmethod
+    def _column_means(df: pd.DataFrame, cols: List[str]) -> pd.Series:
+        """NaN-skipping mean of each column, reduced on raw float arrays"""
+        # Blocks are sliced by position straight from df, so the score columns
+        # are never copied out as a whole first
+        positions = df.columns.get_indexer(cols)
+        # Numeric columns convert straight to floats; only object columns
+        # (e.g. mixed numbers and strings) go through pd.to_numeric
+        numeric_cols = set(df.iloc[:0, positions].select_dtypes(include=[np.number]).columns)
+        coerce_cols = [c for c in cols if c not in numeric_cols]
+        totals = np.zeros(len(cols), dtype=np.float64)
+        counts = np.zeros(len(cols), dtype=np.int64)
+        # Fixed-size row blocks keep the float matrix small however many
+        # samples were scored; running sums/counts give the exact mean
+        for start in range(0, len(df), SCORE_CHUNK_ROWS):
+            block = df.iloc[start:start + SCORE_CHUNK_ROWS, positions]
+            if coerce_cols:
+                block = block.assign(**{
+                    c: pd.to_numeric(block[c], errors='coerce') for c in coerce_cols
+                })
+            # Scores are small integers, so float32 is exact for the inputs and
+            # halves the bytes the reduction reads
+            values = block.to_numpy(dtype=np.float32, na_value=np.nan)
+            totals += np.nansum(values, axis=0, dtype=np.float64)
+            # Non-NaN count without materializing a negated mask
+            counts += values.shape[0] - np.isnan(values).sum(axis=0)
+        # All-NaN (or absent) columns legitimately average to NaN
+        with np.errstate(invalid="ignore"):
+            return pd.Series(totals / counts, index=cols, dtype=np.float64)
+
     def _log_aggregated_metrics(self, results):
         """
         Extract and log aggregated metrics from evaluation results to MLflow UI
@@ -783,75 +1817,95 @@ RESPONSE: {response_text}"""
         """
         print("\nLogging aggregated metrics to MLflow UI...")
 
+        # Checked once up front: outside a run, log_metrics would silently
+        # start a new one instead of attaching the scores to this evaluation
+        if mlflow.active_run() is None:
+            print("  [WARNING] No active MLflow run; aggregated metrics not logged")
+            return
+
         try:
             # Try to get scores from result_df (DataFrame with evaluation results)
-            if hasattr(results, 'result_df') and results.result_df is not None and not results.result_df.empty:
-                print(f"  Found result_df with {len(results.result_df)} rows")
-
-                # Define criteria with max scores (Total: 100 points)
-                # Note: MLflow GenAI stores scores in columns named "/value" not "/score"
-                criteria_max_scores = {
-                    "syntax_correctness": 35,
-                    "semantic_correctness": 30,
-                    "query_efficiency": 15,
-                    "natural_language": 15,
-                    "relevance": 5,
-                }
-
-                metrics_logged = []
-                total_score = 0
-                criteria_count = 0
-
-                # Calculate average for each criterion from the DataFrame
-                for criterion_name, max_score in criteria_max_scores.items():
-                    value_col = f"{criterion_name}/value"
-                    if value_col in results.result_df.columns:
-                        # Get non-null scores and convert to numeric
-                        scores = pd.to_numeric(results.result_df[value_col], errors='coerce').dropna()
-
-                        if len(scores) > 0:
-                            avg_score = round(scores.mean(), 2)
-
-                            # Log the average score with max in metric name for clarity
-                            mlflow.log_metric(f"{criterion_name}_out_of_{max_score}", avg_score)
-
-                            percentage = (avg_score / max_score * 100) if max_score > 0 else 0
-                            metrics_logged.append(f"{criterion_name}: {avg_score:.2f}/{max_score} ({percentage:.1f}%)")
-                            total_score += avg_score
-                            criteria_count += 1
-
+            # Bound once; some MLflow versions materialize result_df lazily
+            df = getattr(results, 'result_df', None)
+            n_rows = df.shape[0] if df is not None else 0
+            if n_rows:
+                print(f"  Found result_df with {n_rows} rows")
+
+                # Criteria the judges produced a score column for
+                col_index = set(df.columns)
+                present = [crit for crit in CRITERIA if crit.value_col in col_index]
+
+                # Trace-only frame (no judge emitted a known criterion): skip
+                # the coercion and averaging entirely
+                if not present:
+                    print("  [WARNING] No criterion scores found in result_df")
+                    return
+
+                # Coerce and average every judge score column in one pass
+                means = self._column_means(df, [crit.value_col for crit in present])
+
+                # Round every average and flag the criteria with no numeric
+                # scores (all NaN) in one vectorized call each; means are in
+                # the same order as present, so they zip without label lookups
+                rounded = means.round(2).to_numpy()
+                has_scores = means.notna().to_numpy()
+                scored = [
+                    (crit, float(avg))
+                    for crit, avg, has_score in zip(present, rounded, has_scores)
+                    if has_score
+                ]
+                criteria_count = len(scored)
+
+                # Run-level counters first, then the criteria with the max in
+                # the metric name for clarity
+                metrics_to_log: Dict[str, float] = dict(self._run_metrics)
+                metrics_to_log.update(
+                    (f"{crit.name}_out_of_{crit.max_points}", avg) for crit, avg in scored
+                )
                 # Calculate and log category totals (but not overall yet)
                 if criteria_count > 0:
-                    query_gen = 0
-                    response_qual = 0
-
-                    for criterion_name in criteria_max_scores.keys():
-                        value_col = f"{criterion_name}/value"
-                        if value_col in results.result_df.columns:
-                            avg = pd.to_numeric(results.result_df[value_col], errors='coerce').dropna().mean()
-                            if criterion_name in ["syntax_correctness", "semantic_correctness", "query_efficiency"]:
-                                query_gen += avg
-                            elif criterion_name in ["natural_language", "relevance"]:
-                                response_qual += avg
-
-                    # Round category totals to 2 decimal places
-                    query_gen = round(query_gen, 2)
-                    response_qual = round(response_qual, 2)
-                    total_score = round(total_score, 2)
-
-                    mlflow.log_metric("query_generation_out_of_80", query_gen)
-                    mlflow.log_metric("response_quality_out_of_20", response_qual)
-
-                    # Log overall score last so it appears at the bottom of the metrics table
-                    mlflow.log_metric("overall_score_out_of_100", total_score)
-
-                    metrics_logged.append(f"overall_score: {total_score:.2f}/100")
-
-                    print(f"  Logged {len(metrics_logged)} aggregated metrics to Metrics tab")
-                    for metric in metrics_logged[:4]:
+                    # Category totals straight from the means as one float
+                    # array in CRITERIA order; missing or all-NaN criteria
+                    # count as 0 (nansum skips NaN)
+                    criterion_means = means.reindex(CRITERIA_VALUE_COLUMNS).to_numpy(dtype=np.float64)
+                    category_totals = {
+                        metric_name: float(np.nansum(criterion_means[criteria_slice]))
+                        for metric_name, criteria_slice in CATEGORY_SLICES.items()
+                    }
+                    for metric_name, category_total in category_totals.items():
+                        metrics_to_log[metric_name] = round(category_total, 2)
+
+                    # Every criterion sits in exactly one category, so the
+                    # overall score reuses the category sums
+                    total_score = round(sum(category_totals.values()), 2)
+
+                    # Overall score last so it appears at the bottom of the metrics table
+                    metrics_to_log["overall_score_out_of_100"] = total_score
+
+                    # One log_batch request instead of a round-trip per metric;
+                    # the counters are cleared first so a failed request is
+                    # not retried by the flush below
+                    self._run_metrics.clear()
+                    mlflow.log_metrics(metrics_to_log)
+
+                    # Criteria plus the overall score; only the first four are
+                    # shown, so only those lines are ever formatted
+                    metrics_count = criteria_count + 1
+                    print(f"  Logged {metrics_count} aggregated metrics to Metrics tab")
+                    preview = itertools.islice(
+                        itertools.chain(
+                            (
+                                f"{crit.name}: {avg:.2f}/{crit.max_points} ({avg / crit.max_points * 100:.1f}%)"
+                                for crit, avg in scored
+                            ),
+                            (f"overall_score: {total_score:.2f}/100",),
+                        ),
+                        4,
+                    )
+                    for metric in preview:
                         print(f"     - {metric}")
-                    if len(metrics_logged) > 4:
-                        print(f"     - ... and {len(metrics_logged) - 4} more")
+                    if metrics_count > 4:
+                        print(f"     - ... and {metrics_count - 4} more")
                 else:
                     print("  [WARNING] No criterion scores found in result_df")
             else:
@@ -859,81 +1913,66 @@ RESPONSE: {response_text}"""
                 print("     Scores are available in the Traces tab -> Assessments section")
 
         except Exception as e:
-            import traceback
             print(f"  [WARNING] Could not extract aggregated metrics: {e}")
-            print(f"     Error details: {traceback.format_exc()}")
             print("     Scores are still available in the Traces tab -> Assessments section")
+            # The stack is only walked and formatted when --debug is on
+            logger.debug("Aggregated metrics failure details", exc_info=True)
+        finally:
+            # No scores to batch them with: run-level counters still go out
+            if self._run_metrics:
+                run_metrics = dict(self._run_metrics)
+                self._run_metrics.clear()
+                try:
+                    mlflow.log_metrics(run_metrics)
+                except Exception as e:
+                    print(f"  [WARNING] Could not log run counters: {e}")
+                    logger.debug("Run counter logging failure details", exc_info=True)
 
     def _print_summary(self, results):
         """Print evaluation summary"""
-        print("\nEVALUATION SUMMARY")
-        print("=" * 70)
-
         # MLflow GenAI evaluate() returns results object with tables
         # Metrics are aggregated in the MLflow UI, not directly accessible here
-        print("\nEvaluation complete! Results logged to MLflow.")
-        print("\nTo view detailed scores:")
-        print("  1. Open MLflow UI: http://localhost:5000")
-        print("  2. Go to the 'Traces' tab in your run")
-        print("  3. View individual scores for each criterion")
-        print("  4. Check the 'Metrics' tab for aggregated scores")
-
-        # Print what we know
-        print("\nJudges Executed:")
-        print("  - Syntax Correctness (0-15 points)")
-        print("  - Semantic Correctness (0-20 points)")
-        print("  - Query Efficiency (0-15 points)")
-        print("  - Data Correctness (0-20 points)")
-        print("  - Completeness (0-10 points)")
-        print("  - Natural Language (0-10 points)")
-        print("  - Relevance (0-5 points)")
-        print("  - Formatting (0-5 points)")
-
-        print("\nTotal Possible: 100 points")
-
-        print("\n" + "=" * 70)
+        sys.stdout.write(SUMMARY_TEXT)
+        sys.stdout.flush()
 
 
 def main():
     """Main entry point"""
-    parser = argparse.ArgumentParser(
-        description="Unified Procurement Assistant Evaluation Framework"
-    )
-    parser.add_argument(
-        "--queries",
-        type=str,
-        default="evaluate.txt",
-        help="Path to queries file (default: evaluate.txt)"
-    )
-    parser.add_argument(
-        "--sample",
-        type=int,
-        default=None,
-        help="Evaluate only first N queries"
-    )
-    parser.add_argument(
-        "--run-name",
-        type=str,
-        default=None,
-        help="Custom MLflow run name"
-    )
-    parser.add_argument(
-        "--experiment",
-        type=str,
-        default="procurement-assistant-evaluation",
-        help="MLflow experiment name"
-    )
-
-    args = parser.parse_args()
-
-    # Create framework
-    framework = EvaluationFramework(experiment_name=args.experiment, run_name=args.run_name)
-
-    # Run evaluation
-    framework.run_evaluation(
-        queries_file=args.queries,
-        sample_size=args.sample
-    )
+    args = _parse_args()
+
+    # Progress messages go through this module's logger; EVAL_LOG=DEBUG shows
+    # per-judge and per-query detail. The root stays at WARNING so client
+    # libraries do not log every HTTP request.
+    logging.basicConfig(format="%(message)s")
+    level = os.environ.get("EVAL_LOG", "INFO").upper()
+    if level not in logging.getLevelNamesMapping():
+        logger.warning("Unknown EVAL_LOG level %r; using INFO", level)
+        level = "INFO"
+    logger.setLevel(logging.DEBUG if args.debug else level)
+
+    if args.cache_invalidate:
+        EvaluationFramework.clear_prediction_cache()
+
+    # Create framework; leaving the block stops its event loop and closes
+    # its connections even if the evaluation fails
+    with EvaluationFramework(
+        experiment_name=args.experiment,
+        run_name=args.run_name,
+        use_cache=args.use_cache
+    ) as framework:
+        # Run evaluation
+        framework.run_evaluation(
+            queries_file=args.queries,
+            sample_size=args.sample,
+            concurrency=args.concurrency,
+            async_judges=args.async_judges,
+            judge_concurrency=args.judge_concurrency,
+            batch_judges=args.batch_judges,
+            combined_judge=args.combined_judge,
+            judge_batch_size=args.judge_batch_size,
+            responses_file=args.responses,
+            skip_generation=args.skip_generation
+        )
 
 
 if __name__ == "__main__":
@@ -12,6 +12,17 @@ class Config:
     MONGO_DB = "procurement_db"
     MONGO_COLLECTION = "purchase_orders"
 
+    # MongoDB connection pool (sized for concurrent workflow runs)
+    MONGO_CLIENT_OPTIONS = {
+        "maxPoolSize": 64,
+        "minPoolSize": 8,  # Pre-warmed so first queries skip the connect handshake
+        "maxConnecting": 8,  # Default of 2 throttles concurrent connection setup
+        "maxIdleTimeMS": 60_000,
+        "connectTimeoutMS": 10_000,
+        "socketTimeoutMS": 30_000,
+        "retryReads": True,
+    }
+
     # Memory Configuration
     CONVERSATIONS_COLLECTION = "conversations"
     CHROMA_DB_PATH = "./chroma_db"
@@ -2,7 +2,7 @@
 Guardrails for the procurement agent
 Ensures safe input/output without restricting topics (router handles routing)
 """
-from typing import Dict, Any, Literal
+from typing import Dict, Any, Literal, Optional
 from openai import OpenAI
 import os
 import re
@@ -17,8 +17,9 @@ except ImportError:
 class SafetyGuardrails:
     """Input/output validation focused on safety, not topic restriction"""
 
-    def __init__(self, openai_api_key: str = None):
-        self.client = OpenAI(api_key=openai_api_key or os.getenv("OPENAI_API_KEY"))
+    def __init__(self, openai_api_key: str = None, client: Optional[OpenAI] = None):
+        # Reuse the caller's client (and its connection pool) when one is given
+        self.client = client or OpenAI(api_key=openai_api_key or os.getenv("OPENAI_API_KEY"))
 
     def validate_input(self, user_message: str, user_id: str = "unknown") -> tuple[bool, str, dict]:
         """
@@ -117,16 +118,30 @@ class SafetyGuardrails:
         return sanitized, metadata
 
 
+_guardrails = None
+
+
+def get_guardrails() -> SafetyGuardrails:
+    """Get or create the shared guardrails (on the shared OpenAI client)"""
+    global _guardrails
+    if _guardrails is None:
+        from ..config import Config
+        from ..llm_client import get_openai_client
+        _guardrails = SafetyGuardrails(
+            openai_api_key=Config.OPENAI_API_KEY,
+            client=get_openai_client()
+        )
+    return _guardrails
+
+
 def input_guardrails_node(state: Dict) -> Dict:
     """
     LangGraph node for input validation
     Validates SAFETY only, not topic (router handles routing)
     """
-    from ..config import Config
-
     print("Input Guardrails: Validating user input...")
 
-    guardrails = SafetyGuardrails(openai_api_key=Config.OPENAI_API_KEY)
+    guardrails = get_guardrails()
 
     user_message = state.get("user_message", "")
     user_id = state.get("user_id", "unknown")
@@ -160,8 +175,6 @@ def output_guardrails_node(state: Dict) -> Dict:
     LangGraph node for output sanitization
     Sanitizes output for safety
     """
-    from ..config import Config
-
     print("Output Guardrails: Sanitizing agent response...")
 
     # Skip if validation failed earlier
@@ -169,7 +182,7 @@ def output_guardrails_node(state: Dict) -> Dict:
         print("   Skipping (input validation failed)")
         return state
 
-    guardrails = SafetyGuardrails(openai_api_key=str(Config.OPENAI_API_KEY))
+    guardrails = get_guardrails()
 
     agent_response = state.get("agent_response", "")
 
@@ -2,10 +2,10 @@
 Procurement Agent Node
 Data-only agent - answers questions using California procurement database
 """
-from typing import Dict
-from openai import OpenAI
+from typing import Dict, Optional
 from ..mongodb_query import MongoDBQueryAgent
 from ..config import Config
+from ..llm_client import get_openai_client
 
 try:
     import mlflow
@@ -17,7 +17,7 @@ except ImportError:
 def generate_error_explanation(user_query: str, error_msg: str) -> str:
     """Generate a helpful error explanation using LLM"""
     try:
-        client = OpenAI(api_key=Config.OPENAI_API_KEY)
+        client = get_openai_client()
         response = client.chat.completions.create(
             model=Config.LLM_MODEL,
             messages=[
@@ -50,15 +50,17 @@ def generate_error_explanation(user_query: str, error_msg: str) -> str:
 _mongodb_agent = None
 
 
-def get_mongodb_agent() -> MongoDBQueryAgent:
-    """Get or create MongoDB query agent"""
+def get_mongodb_agent(schema: Optional[Dict] = None) -> MongoDBQueryAgent:
+    """Get or create MongoDB query agent (schema is only used on creation)"""
     global _mongodb_agent
     if _mongodb_agent is None:
         _mongodb_agent = MongoDBQueryAgent(
             mongo_uri=Config.MONGO_URI,
             db_name=Config.MONGO_DB,
             collection_name=Config.MONGO_COLLECTION,
-            openai_api_key=Config.OPENAI_API_KEY
+            openai_api_key=Config.OPENAI_API_KEY,
+            schema=schema,
+            openai_client=get_openai_client()
         )
     return _mongodb_agent
 
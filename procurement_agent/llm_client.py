@@ -0,0 +1,17 @@
+"""
+Shared OpenAI client
+Nodes reuse one client (and its HTTP connection pool) instead of building one per call
+"""
+from openai import OpenAI
+from .config import Config
+
+
+_openai_client = None
+
+
+def get_openai_client() -> OpenAI:
+    """Get or create the shared OpenAI client"""
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = OpenAI(api_key=Config.OPENAI_API_KEY)
+    return _openai_client
@@ -7,12 +7,170 @@ from datetime import datetime
 from pymongo import MongoClient
 from bson import ObjectId
 from openai import OpenAI
-from typing import Dict, Any, cast
+from typing import Dict, Any, Optional, cast
 import os
 from pathlib import Path
-from .prompts.prompts import SYSTEM_PROMPT
+from .config import Config
+from .prompts.prompts import SYSTEM_PROMPT, RESULTS_EXPLANATION_PROMPT
 from .prompts.data_columns import DGS_PURCHASING_DATA_DICT
 
+# $type names -> Python type names of the decoded values
+BSON_TO_PYTHON_TYPE = {
+    "string": "str",
+    "double": "float",
+    "int": "int",
+    "long": "int",
+    "decimal": "Decimal128",
+    "bool": "bool",
+    "date": "datetime",
+    "null": "NoneType",
+    "objectId": "ObjectId",
+    "array": "list",
+    "object": "dict",
+    "binData": "bytes",
+}
+
+
+def get_collection_schema(collection, sample_size: int = 100) -> Dict:
+    # TODO: ensure that sample values are not empty or None
+    """
+    Get enriched collection schema with business context.
+
+    Returns field names, types, AND business descriptions from data_columns.py
+    """
+    # CSV to MongoDB field mapping
+    CSV_TO_MONGODB_FIELD_MAP = {
+        "Creation Date": "creation_date",
+        "Purchase Date": "purchase_date",
+        "Fiscal Year": "fiscal_year",
+        "LPA Number": "lpa_number",
+        "Purchase Order Number": "purchase_order_number",
+        "Requisition Number": "requisition_number",
+        "Acquisition Type": "acquisition_type",
+        "Sub-Acquisition Type": "sub_acquisition_type",
+        "Acquisition Method": "acquisition_method",
+        "Sub-Acquisition Method": "sub_acquisition_method",
+        "Department Name": "department_name",
+        "Supplier Code": "supplier_code",
+        "Supplier Name": "supplier_name",
+        "Supplier Qualifications": "supplier_qualifications",
+        "Supplier Zip Code": "supplier_zip_code",
+        "CalCard": "cal_card",
+        "Item Name": "item_name",
+        "Item Description": "item_description",
+        "Quantity": "quantity",
+        "Unit Price": "unit_price",
+        "Total Price": "total_price",
+        "Classification Codes": "classification_codes",
+        "Normalized UNSPSC": "normalized_unspsc",
+        "Commodity Title": "commodity_title",
+        "Class": "class",
+        "Class Title": "class_title",
+        "Family": "family",
+        "Family Title": "family_title",
+        "Segment": "segment",
+        "Segment Title": "segment_title",
+        "Location": "location"
+    }
+
+    # Field names, BSON types and a few sample values are extracted server-side,
+    # so one row per field crosses the wire instead of every sampled document
+    field_stats = list(collection.aggregate([
+        {"$sample": {"size": sample_size}},
+        {"$project": {"_id": 0, "kv": {"$objectToArray": "$$ROOT"}}},
+        {"$unwind": {"path": "$kv", "includeArrayIndex": "pos"}},
+        {"$match": {"kv.k": {"$ne": "_id"}}},
+        {"$group": {
+            "_id": {"k": "$kv.k", "t": {"$type": "$kv.v"}},
+            "count": {"$sum": 1},
+            "pos": {"$min": "$pos"},
+            "values": {"$addToSet": "$kv.v"},
+        }},
+        {"$project": {"count": 1, "pos": 1, "values": {"$slice": ["$values", 5]}}},
+        {"$group": {
+            "_id": "$_id.k",
+            "types": {"$push": {"t": "$_id.t", "n": "$count"}},
+            "pos": {"$min": "$pos"},
+            "values": {"$push": "$values"},
+        }},
+        # Keep fields in document order, as the prompt schema always listed them
+        {"$sort": {"pos": 1, "_id": 1}},
+    ]))
+
+    if not field_stats:
+        return {}
+
+    fields = {}
+    for stat in field_stats:
+        types = {}
+        for entry in stat["types"]:
+            # Report the Python type names the driver decodes to, as before
+            value_type = BSON_TO_PYTHON_TYPE.get(entry["t"], entry["t"])
+            types[value_type] = types.get(value_type, 0) + entry["n"]
+
+        # Collect sample values (limit to 5)
+        sample_values = []
+        for values in stat["values"]:
+            for value in values:
+                if len(sample_values) < 5 and str(value) not in sample_values:
+                    sample_values.append(str(value))
+
+        fields[stat["_id"]] = {"types": types, "sample_values": sample_values}
+
+    # Create reverse mapping
+    mongodb_to_csv = {v: k for k, v in CSV_TO_MONGODB_FIELD_MAP.items()}
+
+    # Determine primary type and enrich with business context
+    for field_name, field_info in fields.items():
+        types = field_info["types"]
+
+        # Determine primary type (prefer non-None types)
+        if len(types) > 1 and "NoneType" in types:
+            types_without_none = {k: v for k, v in types.items() if k != "NoneType"}
+            if types_without_none:
+                primary_type = max(types_without_none.items(), key=lambda x: x[1])[0]
+            else:
+                primary_type = "NoneType"
+        else:
+            primary_type = max(types.items(), key=lambda x: x[1])[0]
+
+        fields[field_name]["type"] = primary_type
+
+        # Calculate nullable status and percentage
+        has_none = "NoneType" in types
+        none_count = types.get("NoneType", 0)
+        total_count = sum(types.values())
+
+        fields[field_name]["nullable"] = has_none
+        if has_none:
+            fields[field_name]["null_percentage"] = round(none_count / total_count * 100, 1)
+
+        # Remove internal types dict (not needed in final schema)
+        del fields[field_name]["types"]
+
+        # ENRICHMENT: Add business description from data_columns.py
+        if field_name in mongodb_to_csv:
+            csv_field = mongodb_to_csv[field_name]
+            if csv_field in DGS_PURCHASING_DATA_DICT:
+                fields[field_name]["description"] = DGS_PURCHASING_DATA_DICT[csv_field]
+
+        # Add usage notes for converted fields
+        if field_name.endswith("_str"):
+            fields[field_name]["note"] = "Display only - use non-_str version for queries"
+        elif field_name == "creation_date":
+            fields[field_name]["note"] = "Datetime object - use for date queries with $gte, $lte"
+        elif field_name == "purchase_date":
+            fields[field_name]["note"] = "Datetime object - use for date queries (creation_date preferred)"
+        elif field_name in ["total_price", "unit_price"]:
+            fields[field_name]["note"] = "Float - use for numeric operations ($gt, $sum, $avg)"
+        elif field_name == "quantity":
+            fields[field_name]["note"] = "Integer - use for counting and arithmetic"
+        elif field_name == "acquisition_number":
+            fields[field_name]["type"] = "str"
+            fields[field_name]["sample_values"].extend(["REQ0009786", "REQ0009048"])
+
+    return fields
+
 
 class MongoDBQueryAgent:
     """MongoDB query agent for procurement data"""
@@ -22,14 +180,21 @@ class MongoDBQueryAgent:
         mongo_uri: str,
         db_name: str,
         collection_name: str,
-        openai_api_key: str = ''
+        openai_api_key: str = '',
+        schema: Optional[Dict] = None,
+        openai_client: Optional[OpenAI] = None
     ):
-        self.client = MongoClient(mongo_uri)
+        self.client = MongoClient(mongo_uri, **Config.MONGO_CLIENT_OPTIONS)
         self.db = self.client[db_name]
         self.collection = self.db[collection_name]
-        self.openai_client = OpenAI(api_key=openai_api_key or os.getenv("OPENAI_API_KEY"))
-        self.schema = self._get_collection_schema()
-        self._save_schema_to_file()  # Save schema every time
+        # Reuse the caller's client (and its connection pool) when one is given
+        self.openai_client = openai_client or OpenAI(api_key=openai_api_key or os.getenv("OPENAI_API_KEY"))
+        if schema:
+            # Already sampled by the caller (e.g. the evaluator's schema cache)
+            self.schema = schema
+        else:
+            self.schema = self._get_collection_schema()
+            self._save_schema_to_file()  # Save schema every time
         self.system_prompt_template = SYSTEM_PROMPT # self._load_system_prompt()
 
     # def _load_system_prompt(self) -> str:
@@ -39,124 +204,12 @@ class MongoDBQueryAgent:
     #         return f.read()
 
     def _get_collection_schema(self, sample_size: int = 100) -> Dict:
-        # TODO: ensure that sample values are not empty or None
         """
         Get enriched collection schema with business context.
 
         Returns field names, types, AND business descriptions from data_columns.py
         """
-        # CSV to MongoDB field mapping
-        CSV_TO_MONGODB_FIELD_MAP = {
-            "Creation Date": "creation_date",
-            "Purchase Date": "purchase_date",
-            "Fiscal Year": "fiscal_year",
-            "LPA Number": "lpa_number",
-            "Purchase Order Number": "purchase_order_number",
-            "Requisition Number": "requisition_number",
-            "Acquisition Type": "acquisition_type",
-            "Sub-Acquisition Type": "sub_acquisition_type",
-            "Acquisition Method": "acquisition_method",
-            "Sub-Acquisition Method": "sub_acquisition_method",
-            "Department Name": "department_name",
-            "Supplier Code": "supplier_code",
-            "Supplier Name": "supplier_name",
-            "Supplier Qualifications": "supplier_qualifications",
-            "Supplier Zip Code": "supplier_zip_code",
-            "CalCard": "cal_card",
-            "Item Name": "item_name",
-            "Item Description": "item_description",
-            "Quantity": "quantity",
-            "Unit Price": "unit_price",
-            "Total Price": "total_price",
-            "Classification Codes": "classification_codes",
-            "Normalized UNSPSC": "normalized_unspsc",
-            "Commodity Title": "commodity_title",
-            "Class": "class",
-            "Class Title": "class_title",
-            "Family": "family",
-            "Family Title": "family_title",
-            "Segment": "segment",
-            "Segment Title": "segment_title",
-            "Location": "location"
-        }
-
-        sample_docs = list(self.collection.aggregate([{"$sample": {"size": sample_size}}]))
-
-        if not sample_docs:
-            return {}
-
-        fields = {}
-        for doc in sample_docs:
-            for key, value in doc.items():
-                if key == "_id":
-                    continue
-                if key not in fields:
-                    fields[key] = {"types": {}, "sample_values": set()}
-                value_type = type(value).__name__
-                if value_type not in fields[key]["types"]:
-                    fields[key]["types"][value_type] = 0
-                fields[key]["types"][value_type] += 1
-
-                # Collect sample values (limit to 5)
-                if len(fields[key]["sample_values"]) < 5:
-                    fields[key]["sample_values"].add(str(value))
-
-        # Create reverse mapping
-        mongodb_to_csv = {v: k for k, v in CSV_TO_MONGODB_FIELD_MAP.items()}
-
-        # Determine primary type and enrich with business context
-        for field_name, field_info in fields.items():
-            types = field_info["types"]
-
-            # Determine primary type (prefer non-None types)
-            if len(types) > 1 and "NoneType" in types:
-                types_without_none = {k: v for k, v in types.items() if k != "NoneType"}
-                if types_without_none:
-                    primary_type = max(types_without_none.items(), key=lambda x: x[1])[0]
-                else:
-                    primary_type = "NoneType"
-            else:
-                primary_type = max(types.items(), key=lambda x: x[1])[0]
-
-            fields[field_name]["type"] = primary_type
-
-            # Calculate nullable status and percentage
-            has_none = "NoneType" in types
-            none_count = types.get("NoneType", 0)
-            total_count = sum(types.values())
-
-            fields[field_name]["nullable"] = has_none
-            if has_none:
-                fields[field_name]["null_percentage"] = round(none_count / total_count * 100, 1)
-
-            # Convert sample_values from set to list
-            fields[field_name]["sample_values"] = list(fields[field_name]["sample_values"])
-
-            # Remove internal types dict (not needed in final schema)
-            del fields[field_name]["types"]
-
-            # ENRICHMENT: Add business description from data_columns.py
-            if field_name in mongodb_to_csv:
-                csv_field = mongodb_to_csv[field_name]
-                if csv_field in DGS_PURCHASING_DATA_DICT:
-                    fields[field_name]["description"] = DGS_PURCHASING_DATA_DICT[csv_field]
-
-            # Add usage notes for converted fields
-            if field_name.endswith("_str"):
-                fields[field_name]["note"] = "Display only - use non-_str version for queries"
-            elif field_name == "creation_date":
-                fields[field_name]["note"] = "Datetime object - use for date queries with $gte, $lte"
-            elif field_name == "purchase_date":
-                fields[field_name]["note"] = "Datetime object - use for date queries (creation_date preferred)"
-            elif field_name in ["total_price", "unit_price"]:
-                fields[field_name]["note"] = "Float - use for numeric operations ($gt, $sum, $avg)"
-            elif field_name == "quantity":
-                fields[field_name]["note"] = "Integer - use for counting and arithmetic"
-            elif field_name == "acquisition_number":
-                fields[field_name]["type"] = "str"
-                fields[field_name]["sample_values"].extend(["REQ0009786", "REQ0009048"])
-
-        return fields
+        return get_collection_schema(self.collection, sample_size)
 
     def _save_schema_to_file(self):
         """Save the generated schema to data/collection_schema.json"""
@@ -583,50 +636,7 @@ class MongoDBQueryAgent:
                 messages=[
                     {
                         "role": "system",
-                        "content": """You are a friendly, knowledgeable data analyst who explains California procurement data in natural, engaging language.
-
-PERSONALITY:
-- Conversational and warm (not robotic)
-- Enthusiastic about insights and patterns
-- Use natural transitions ("Interesting!", "Here's what stands out", "Let me break this down")
-- Vary your sentence structure
-- Tell a story with the data
-
-FORMATTING RULES:
-1. Start with a natural sentence, not "Found X results"
-2. Use conversational intros
-3. Mix narrative with data points
-4. Highlight surprising insights with natural reactions
-5. Use natural language without emojis
-6. Format numbers clearly: $484M (not 484000000), $55.1M, etc.
-7. Organize and well structured responses with markdown where appropriate or bullets for clarity and conciseness
-8. If partial results, naturally suggest: "Want to see all the details? Check out the Technical Details button below"
-
-STRUCTURE:
-- Opening: Natural intro sentence about what the data shows
-- Key findings: Top 5-10 results with context
-- Insight: One interesting pattern or standout finding
-- Closing: Friendly pointer to technical details if there's more data
-
-AVOID:
-- "Found X results" (too robotic)
-- Bullet points only (mix with narrative)
-- Dry statistical language
-- Repeating "total", "results", "query returned"
-
-EXAMPLE:
-Instead of: "Found 83 departments. Top 10: 1. Health Care: $484M..."
-Write: "Looking at spending across California's departments, Health Care Services absolutely dominates with $484M - that's nearly 65% of all procurement spending! Here are the top departments:
-
-**Health Care Services** leads the pack at $484.4M
-**Water Resources** comes in second at $55.1M
-**Transportation** rounds out the top three at $54.3M
-...
-
-What really stands out is how concentrated the spending is - just these top 5 departments account for over 80% of the total budget.
-
-Want the complete breakdown of all 83 departments? Click Technical Details below to see everything and download the data."
-""",
+                        "content": RESULTS_EXPLANATION_PROMPT,
                     },
                     {"role": "user", "content": context},
                 ],